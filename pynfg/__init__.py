@@ -14,6 +14,7 @@ from .classes.deternode import DeterNode
 from .classes.node import Node
 from .classes.iterseminfg import iterSemiNFG
 from .classes.seminfg import SemiNFG
+from .classes.gamestate import GameState
 from .levelksolutions import api as levelksolutions
 #from .rlsolutions import mcrl, qlearning
 #from .pgtsolutions.intelligence import
@@ -15,8 +15,6 @@ GNU Affero General Public License
 from __future__ import division
 import inspect
 import numpy as np
-import scipy as sp
-import scipy.stats.distributions as randvars
 from node import *
 
 class ChanceNode(Node):
@@ -145,12 +143,14 @@ class ChanceNode(Node):
             self.params = distip[1]
             parlist = filter(lambda x: isinstance(x,Node), self.params)
             self.parents = self._set_parent_dict(parlist)
+            import scipy.stats.distributions as randvars
             self.continuous = (randvars.rv_continuous in \
                                 inspect.getmro(type(self.distribution)))
             if self.continuous is False:
                 self.space = distip[2]
             else:
                 self.space = []
+        self._set_space_index()
 #        self.draw_value()
 
     def __str__(self):
@@ -201,15 +201,39 @@ class ChanceNode(Node):
                 return r
         else:
             indo = self.get_CPTindex(parentinput, valueinput=False)
-            cdf = np.cumsum(self.CPT[indo])
-            cutoff = np.random.rand()
-            idx = np.nonzero( cdf >= cutoff )[0][0]
+            idx = self._draw_CPT_index(indo)
             if setvalue:
                 self.set_valueindex(idx)
                 return self.get_value()
             else:
                 return self.space[idx]
 
+    def draw_batch(self, parentindex, parentvalues):
+        """Draw a batch of values from the :class:`classes.ChanceNode` object
+
+        :arg parentindex: an (n, number of parents) integer array of parent
+           valueindices in the order of the parents OrderedDict. Entries for
+           continuous parents are ignored.
+        :type parentindex: np.array
+        :arg parentvalues: one entry per parent in the order of the parents
+           OrderedDict. Entries are None for discrete parents and sequences of
+           n values for continuous parents.
+        :type parentvalues: list
+        :returns: an n-vector of valueindices if the ChanceNode is discrete,
+           and an n-vector of values otherwise.
+
+        .. note::
+
+           For CPT-based ChanceNodes the draws are vectorized. Nodes based on
+           :py:mod:`scipy.stats.distributions` objects are drawn row by row.
+           The current value of the node is not changed.
+
+        """
+        if self.CPT is None:
+            return Node.draw_batch(self, parentindex, parentvalues)
+        else:
+            return self._draw_CPT_batch(parentindex)
+
     def prob(self, parentinput=None, valueinput=None):
         """Compute the conditional probability of the current or specified value
 
@@ -12,9 +12,7 @@ GNU Affero General Public License
 from __future__ import division
 
 import numpy as np
-import scipy as sp
 import copy
-import scipy.stats.distributions as randvars
 from node import *
 from pynfg.utilities.utilities import convert_2_pureCPT
 
@@ -114,6 +112,7 @@ class DecisionNode(Node):
         self.parents = self._set_parent_dict(parents)
         self._createCPT()
         self._check_disc_parents()
+        self._set_space_index()
 #        self.set_value(self.space[0])
         self.continuous = False
 
@@ -172,9 +171,7 @@ class DecisionNode(Node):
         ind = []
         indo = self.get_CPTindex(parentinput, valueinput=False)
         if not mode:
-            cdf = np.cumsum(self.CPT[indo])
-            cutoff = np.random.rand()
-            idx = np.nonzero( cdf >= cutoff )[0][0]
+            idx = self._draw_CPT_index(indo)
         else:
             idx = self.CPT[indo].argmax()
         if setvalue:
@@ -183,6 +180,23 @@ class DecisionNode(Node):
         else:
             return self.space[idx]
 
+    def draw_batch(self, parentindex, parentvalues=None):
+        """Draw a batch of values from the :class:`classes.DecisionNode` object
+
+        :arg parentindex: an (n, number of parents) integer array of parent
+           valueindices in the order of the parents OrderedDict.
+        :type parentindex: np.array
+        :arg parentvalues: ignored, since the parents of a DecisionNode are
+           discrete. Included for consistency with the other node classes.
+        :type parentvalues: list
+        :returns: an n-vector of valueindices drawn from the CPT. The current
+           value of the node is not changed.
+
+        """
+        if not self.CPT.any():
+            raise AttributeError('CPT for %s is just a zeros array' % self.name)
+        return self._draw_CPT_batch(parentindex)
+
     def randomCPT(self, mixed=False, setCPT=True):
         """Create a random CPT for the :class:`classes.DecisionNode` object
 
@@ -203,7 +217,7 @@ class DecisionNode(Node):
         other_dims = CPTshape[0:-1]
         z = np.zeros(CPTshape)
         if mixed is False:
-            y = randvars.randint.rvs(0, shape_last, size=other_dims)
+            y = np.random.randint(0, shape_last, size=other_dims)
             if y.size > 1:
                 z.reshape((-1, shape_last))[np.arange(y.size), y.flatten()]=1
             else:
@@ -211,13 +225,14 @@ class DecisionNode(Node):
         else:
             simplex_draws = np.random.dirichlet(np.ones(shape_last), np.prod(other_dims))
             M = 100000000
-            x = randvars.randint.rvs(1, M, size=other_dims+(shape_last-1,))
+            x = np.random.randint(1, M, size=other_dims+(shape_last-1,))
             y = np.concatenate((np.zeros(other_dims+(1,)), x, \
                                 M*np.ones(other_dims+(1,))), axis=-1)
             yy = np.sort(y, axis=-1)
             z = np.diff(yy, axis=-1)/M
         if setCPT:
-            self.CPT[:] = z
+            self.thaw_CPT()[:] = z
+            self.reset_CPTcache()
         else:
             return z
 
@@ -233,7 +248,8 @@ class DecisionNode(Node):
         z = np.zeros(self.CPT.shape)
         z += 1/(self.CPT.shape[-1])
         if setCPT:
-            self.CPT[:] = z
+            self.thaw_CPT()[:] = z
+            self.reset_CPTcache()
         else:
             return z
 
@@ -282,7 +298,8 @@ class DecisionNode(Node):
             randCPT = self.randomCPT(mixed=True, setCPT=False)
             copiedCPT = copiedCPT*(1-noise) + randCPT*noise
         if setCPT:
-            self.CPT[:] = copiedCPT
+            self.thaw_CPT()[:] = copiedCPT
+            self.reset_CPTcache()
             if returnweight:
                 return weight
         else:
@@ -13,7 +13,9 @@ GNU Affero General Public License
 """
 
 import numpy as np
+from collections import OrderedDict
 from node import *
+from node import _canonical
 
 class DeterNode(Node):
     """Implements a deterministic node for the semi-NFG formalism created
@@ -44,6 +46,15 @@ class DeterNode(Node):
     :type time: integer
     :arg basename: a reference to a theoretical node in the base or kernel.
     :type basename: str.
+    :arg tabulate: Optional. If True, the function is evaluated once over the
+       product of the parent spaces and draws become lookups in
+       :py:attr:`classes.DeterNode.table`. Only for discrete nodes with
+       discrete parents. False by default.
+    :type tabulate: bool
+    :arg memo: Optional. The max number of function values kept in a least
+       recently used memo keyed by the function inputs. None by default, i.e.
+       no memo. See :py:meth:`classes.DeterNode.set_memo()`.
+    :type memo: int
 
     Formally, a deterministic node has the following properties:
 
@@ -88,11 +99,13 @@ class DeterNode(Node):
     * :py:meth:`classes.DeterNode.draw_value()`
     * :py:meth:`classes.DeterNode.prob()`
     * :py:meth:`classes.DeterNode.logprob()`
+    * :py:meth:`classes.DeterNode.tabulate()`
+    * :py:meth:`classes.DeterNode.set_memo()`
 
     """
     def __init__(self, name, func, params, continuous, space=None, \
                  description='no description', time=None, basename=None, \
-                 verbose=False):
+                 verbose=False, tabulate=False, memo=None):
         if verbose:
             try:
                 print 'Name: '+ name + '\nDescription: '+ description
@@ -110,15 +123,129 @@ class DeterNode(Node):
             raise TypeError('The space must be a list')
         self.parents = self._set_parent_dict(params.values())
         self.continuous = continuous
+        self._set_space_index()
 #        self.value = None
 #        self.draw_value()
         self.description = description
         self.time = time
         self.basename = basename
+        self.table = None
+        if tabulate:
+            self.tabulate()
+        self.set_memo(memo)
 
     def __str__(self):
         return self.name
 
+    def tabulate(self):
+        """Evaluate the function over the product of the parent spaces
+
+        Sets :py:attr:`classes.DeterNode.table`, an integer array with one axis
+        per parameter that is a node, in the order of
+        :py:attr:`classes.DeterNode.tabkeys`. Entries are the valueindices of
+        the function output given the valueindices of the parents. Outputs
+        that are not in the space are stored as -1, and the function is called
+        for those parent values as usual.
+
+        Once tabulated, :py:meth:`classes.DeterNode.draw_value()`,
+        :py:meth:`classes.DeterNode.prob()` and
+        :py:meth:`classes.DeterNode.draw_batch()` only index the table.
+
+        .. warning::
+
+           The table is not updated automatically. Call this method again
+           after changing the function, the params or the spaces of the
+           parents. Set :py:attr:`classes.DeterNode.table` to None to go back
+           to calling the function.
+
+        """
+        if self.continuous:
+            raise AttributeError('cont. nodes can not be tabulated')
+        for par in self.parents.values():
+            if par.continuous:
+                raise AttributeError('%s can not be tabulated: %s is ' \
+                                     'continuous' % (self.name, par.name))
+        self.tabkeys = [key for key in self.params \
+                        if isinstance(self.params[key], Node)]
+        shape = tuple(len(self.params[key].space) for key in self.tabkeys)
+        table = -np.ones(shape, dtype=int)
+        funinput = dict((key, val) for key, val in self.params.items() \
+                        if key not in self.tabkeys)
+        for ind in np.ndindex(*shape):
+            for k in xrange(len(ind)):
+                key = self.tabkeys[k]
+                funinput[key] = self.params[key].space[ind[k]]
+            try:
+                table[ind] = self.get_valueindex(self.dfunction(**funinput))
+            except ValueError:
+                pass
+        self.table = table
+
+    def set_memo(self, maxsize=1024):
+        """Keep a bounded memo of function values keyed by function inputs
+
+        Useful when the parent spaces are too large to tabulate, but the same
+        parent values recur across samples. When the memo is full, the least
+        recently used value is evicted. The counters
+        :py:attr:`classes.DeterNode.memo_hits` and
+        :py:attr:`classes.DeterNode.memo_misses` are reset. Inputs without a
+        hashable form are counted as misses.
+
+        :arg maxsize: the max number of memoized function values. None or 0
+           turns the memo off.
+        :type maxsize: int
+
+        .. warning::
+
+           Memoized values are returned as they are, so the function must not
+           depend on anything other than its inputs, and mutable outputs, e.g.
+           np.arrays, are shared between draws.
+
+        """
+        self.memo_size = maxsize
+        self.memo_hits = 0
+        self.memo_misses = 0
+        if maxsize:
+            self.memo = OrderedDict()
+            self._memokeys = sorted(self.params.keys())
+        else:
+            self.memo = None
+
+    def _call_function(self, funinput):
+        """Call the function with funinput, using the memo if there is one
+
+        """
+        memo = getattr(self, 'memo', None)
+        if memo is None:
+            return self.dfunction(**funinput)
+        try:
+            key = tuple(_canonical(funinput[k]) for k in self._memokeys)
+        except TypeError:
+            self.memo_misses += 1
+            return self.dfunction(**funinput)
+        try:
+            r = memo.pop(key)
+            self.memo_hits += 1
+        except KeyError:
+            r = self.dfunction(**funinput)
+            self.memo_misses += 1
+            if len(memo) >= self.memo_size:
+                memo.popitem(last=False)
+        memo[key] = r
+        return r
+
+    def _table_index(self, parentinput):
+        """Return the entry of the table for parentinput or current values
+
+        """
+        ind = []
+        for key in self.tabkeys:
+            if key in parentinput:
+                ind.append(self.params[key].get_valueindex(parentinput[key]))
+            else:
+                ind.append(self.params[key].valueindex)
+        return self.table[tuple(ind)]
+
     def draw_value(self, parentinput=None, setvalue=True):
         """Draw a value from the :class:`classes.DeterNode` object
 
@@ -147,6 +274,14 @@ class DeterNode(Node):
         """
         if parentinput is None:
             parentinput = {}
+        if getattr(self, 'table', None) is not None:
+            idx = self._table_index(parentinput)
+            if idx >= 0:
+                if setvalue:
+                    self.set_valueindex(idx)
+                    return self.value
+                else:
+                    return self.space[idx]
         funinput = {}
         for par in self.params:
             if isinstance(self.params[par],Node):
@@ -156,13 +291,87 @@ class DeterNode(Node):
                     funinput[par] = self.params[par].get_value()
             else:
                 funinput[par] = self.params[par]
-        r = self.dfunction(**funinput)
+        r = self._call_function(funinput)
         if setvalue:
             self.set_value(r)
             return self.value
         else:
             return r
 
+    def draw_batch(self, parentindex, parentvalues):
+        """Compute a batch of values of the :class:`classes.DeterNode` object
+
+        :arg parentindex: an (n, number of parents) integer array of parent
+           valueindices in the order of the parents OrderedDict. Entries for
+           continuous parents are ignored.
+        :type parentindex: np.array
+        :arg parentvalues: one entry per parent in the order of the parents
+           OrderedDict. Entries are None for discrete parents and sequences of
+           n values for continuous parents.
+        :type parentvalues: list
+        :returns: an n-vector of valueindices if the DeterNode is discrete,
+           and an n-vector of values otherwise. The current value of the node
+           is not changed.
+
+        """
+        if getattr(self, 'table', None) is not None:
+            cols = dict(zip(self.parents.keys(), parentindex.T))
+            draws = self.table[tuple(cols[self.params[key].name] \
+                                     for key in self.tabkeys)]
+            missing = np.nonzero(draws < 0)[0]
+            if len(missing):
+                draws[missing] = self._draw_batch_function(parentindex[missing], \
+                                                           parentvalues)
+            return draws
+        return self._draw_batch_function(parentindex, parentvalues)
+
+    def _draw_batch_function(self, parentindex, parentvalues):
+        """Compute a batch of values by calling the function for each row
+
+        """
+        n = parentindex.shape[0]
+        columns = dict(zip(self.parents.keys(), \
+                       self._batch_parent_columns(parentindex, parentvalues)))
+        funinput = {}
+        nodeparams = []
+        for par in self.params:
+            if isinstance(self.params[par], Node):
+                nodeparams.append(par)
+            else:
+                funinput[par] = self.params[par]
+        draws = []
+        for i in xrange(n):
+            for par in nodeparams:
+                funinput[par] = columns[self.params[par].name][i]
+            draws.append(self._call_function(funinput))
+        return self._batch_output(draws)
+
+    def logprob_batch(self, parentindex, parentvalues, values):
+        """Compute the logprob of a batch of values of the DeterNode
+
+        :arg parentindex: an (n, number of parents) integer array of parent
+           valueindices in the order of the parents OrderedDict. Entries for
+           continuous parents are ignored.
+        :type parentindex: np.array
+        :arg parentvalues: one entry per parent in the order of the parents
+           OrderedDict. Entries are None for discrete parents and sequences of
+           n values for continuous parents.
+        :type parentvalues: list
+        :arg values: an n-vector of valueindices if the DeterNode is discrete,
+           and an n-vector of values otherwise.
+        :type values: np.array
+        :returns: an n-vector of logprobs, which are either zero or -inf.
+
+        """
+        draws = self.draw_batch(parentindex, parentvalues)
+        if self.continuous:
+            r = np.array([np.all(draws[i] == values[i]) for i in \
+                          xrange(len(draws))], dtype=float)
+        else:
+            r = 1.0*(draws == values)
+        with np.errstate(divide='ignore'):
+            return np.log(r)
+
     def prob(self, parentinput=None, valueinput=None):
         """Compute the probability of the current or specified value
 
@@ -192,6 +401,15 @@ class DeterNode(Node):
         """
         if parentinput is None:
             parentinput = {}
+        if getattr(self, 'table', None) is not None:
+            idx = self._table_index(parentinput)
+            if idx >= 0:
+                if valueinput is None:
+                    return 1*(self.valueindex == idx)
+                try:
+                    return 1*(self.get_valueindex(valueinput) == idx)
+                except ValueError:
+                    return 0
         funinput = {}
         for par in self.params:
             if isinstance(self.params[par], Node):
@@ -203,10 +421,11 @@ class DeterNode(Node):
                 funinput[par] = self.params[par]
         if valueinput is None:
             valueinput = self.get_value()
+        fval = self._call_function(funinput)
         try:
-            r = 1*(self.dfunction(**funinput) == valueinput).all()
+            r = 1*(fval == valueinput).all()
         except AttributeError:
-            r = 1*(self.dfunction(**funinput) == valueinput)
+            r = 1*(fval == valueinput)
         return r
 
     def logprob(self, parentinput=None, valueinput=None):
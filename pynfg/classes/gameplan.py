@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+"""
+Implements the GamePlan class
+
+Part of: PyNFG - a Python package for modeling and solving Network Form Games
+
+Created on Fri Oct 16 09:12:40 2026
+
+Copyright (C) 2013 James Bono
+
+GNU Affero General Public License
+
+"""
+
+from __future__ import division
+import numpy as np
+
+class GamePlan(object):
+    """A compiled, integer-indexed description of the topology of a SemiNFG
+
+    The plan freezes the structure of the net. Each node gets an integer id
+    given by its position in :py:attr:`seminfg.SemiNFG.iterator`, so parents
+    always have smaller ids than their children. For every node the plan
+    stores the ids of its parents and, for CPT-based nodes, the strides that
+    turn a vector of parent valueindices into a row of the flattened CPT.
+
+    :arg G: the net to be compiled
+    :type G: SemiNFG or iterSemiNFG
+
+    The plan only depends on the structure of the net: node names, parents,
+    the sizes of the spaces and whether a node is CPT-based. CPTs are looked
+    up on the nodes whenever the plan is used, so changing or perturbing CPTs
+    never requires a new plan. Use :py:meth:`seminfg.SemiNFG.compile()` to
+    get the plan of a net. It is rebuilt only when the structure changes.
+
+    Attributes:
+
+    * nodes - list of the nodes in topological order
+    * names - list of the node names in topological order
+    * ids - dict with node names as keys and integer ids as values
+    * parents - list with an integer array of parent ids for each node
+    * children - list with an integer array of child ids for each node
+    * card - integer array with the size of the space of each node, -1 for
+      continuous nodes
+    * isCPT - boolean array, True for nodes drawn from a CPT
+    * strides - list with an integer array for each node such that
+      ``np.dot(parentindex, strides[i])`` is the row of the flattened CPT
+      of node i. None for nodes that are not CPT-based.
+    * level - integer array with the level of each node, 0 for roots and one
+      more than the highest level of its parents otherwise
+    * levels - list with an integer array of node ids for each level. The
+      nodes of a level only depend on nodes in earlier levels.
+
+    Some useful methods:
+
+    * :py:meth:`gameplan.GamePlan.sample()`
+    * :py:meth:`gameplan.GamePlan.resample_order()`
+    * :py:meth:`gameplan.GamePlan.descendants()`
+    * :py:meth:`gameplan.GamePlan.ancestors()`
+    * :py:meth:`gameplan.GamePlan.loglike()`
+    * :py:meth:`gameplan.GamePlan.flatCPT()`
+
+    """
+    def __init__(self, G):
+        self.signature = structure_signature(G.iterator)
+        self.nodes = list(G.iterator)
+        self.names = [n.name for n in self.nodes]
+        self.size = len(self.nodes)
+        self.ids = dict(zip(self.names, range(self.size)))
+        self._set_arrays()
+        self._resample = {}
+        self._reach = None
+        self._reachsets = ({}, {})
+
+    def _set_arrays(self):
+        """Set the integer parent, child, cardinality, stride and level arrays
+
+        """
+        self.parents = []
+        kids = [[] for i in xrange(self.size)]
+        self.card = -np.ones(self.size, dtype=int)
+        self.isCPT = np.zeros(self.size, dtype=bool)
+        self.strides = []
+        for i in xrange(self.size):
+            nod = self.nodes[i]
+            par = np.array([self.ids[nam] for nam in nod.parents], dtype=int)
+            self.parents.append(par)
+            for j in par:
+                kids[j].append(i)
+            if not nod.continuous:
+                self.card[i] = len(nod.space)
+            if getattr(nod, 'CPT', None) is not None:
+                self.isCPT[i] = True
+                self.strides.append(_strides(self.card[par]))
+            else:
+                self.strides.append(None)
+        self.children = [np.array(k, dtype=int) for k in kids]
+        self.level = np.zeros(self.size, dtype=int)
+        levels = []
+        for i in xrange(self.size):
+            if len(self.parents[i]):
+                self.level[i] = np.max(self.level[self.parents[i]])+1
+            if self.level[i] == len(levels):
+                levels.append([])
+            levels[self.level[i]].append(i)
+        self.levels = [np.array(l, dtype=int) for l in levels]
+
+    def matches(self, nodes):
+        """Check whether the plan was compiled from the given structure
+
+        :arg nodes: nodes in topological order
+        :type nodes: list
+        :returns: True if the structure of the nodes is the one compiled in
+           the plan.
+
+        """
+        return structure_signature(nodes) == self.signature
+
+    def resample_order(self, start=None, exclude=None):
+        """Return the nodes drawn by a partial resampling of the net
+
+        :arg start: (Optional) names of the nodes where sampling starts. If
+           unspecified, all nodes are drawn.
+        :type start: list or set
+        :arg exclude: (Optional) names of nodes held at their current values
+        :type exclude: list or set
+        :returns: a list of the nodes in start and their descendants, in
+           topological order and without the nodes in exclude. See
+           :py:meth:`seminfg.SemiNFG.sample()`.
+
+        The orders are cached per frozenset of start and exclude names, so
+        repeated counterfactual resampling only walks the nodes it draws.
+
+        """
+        key = (frozenset(start) if start else None, \
+               frozenset(exclude) if exclude else None)
+        try:
+            return self._resample[key]
+        except KeyError:
+            pass
+        if start:
+            desc = self._reachability()[0]
+            drawn = 0
+            for nam in start:
+                i = self.ids[nam]
+                drawn |= desc[i] | (1 << i)
+        else:
+            drawn = (1 << self.size)-1
+        if exclude:
+            for nam in exclude:
+                drawn &= ~(1 << self.ids[nam])
+        order = [self.nodes[i] for i in _bit_ids(drawn)]
+        self._resample[key] = order
+        return order
+
+    def descendants(self, nodename):
+        """Return the descendants of a node
+
+        :arg nodename: the name of the node
+        :type nodename: str
+        :returns: a frozenset of the nodes that are descendants of the node.
+           The set is cached, so repeated queries are O(1).
+
+        """
+        return self._reachset(0, nodename)
+
+    def ancestors(self, nodename):
+        """Return the ancestors of a node
+
+        :arg nodename: the name of the node
+        :type nodename: str
+        :returns: a frozenset of the nodes that are ancestors of the node.
+           The set is cached, so repeated queries are O(1).
+
+        """
+        return self._reachset(1, nodename)
+
+    def _reachset(self, k, nodename):
+        """Return the cached frozenset of descendants (k=0) or ancestors (1)
+
+        """
+        try:
+            return self._reachsets[k][nodename]
+        except KeyError:
+            bits = self._reachability()[k][self.ids[nodename]]
+            nodes = frozenset(self.nodes[i] for i in _bit_ids(bits))
+            self._reachsets[k][nodename] = nodes
+            return nodes
+
+    def _reachability(self):
+        """Return the transitive closure of the net as bitsets
+
+        :returns: a tuple (desc, anc) of lists of integers. Bit j of desc[i]
+           is set if node j is a descendant of node i, and bit j of anc[i] is
+           set if node j is an ancestor of node i. The closure is computed on
+           the first query in one pass over the topological order in each
+           direction, without recursion.
+
+        """
+        if self._reach is None:
+            desc = [0]*self.size
+            for i in xrange(self.size-1, -1, -1):
+                for j in self.children[i]:
+                    desc[i] |= desc[j] | (1 << int(j))
+            anc = [0]*self.size
+            for i in xrange(self.size):
+                for j in self.parents[i]:
+                    anc[i] |= anc[j] | (1 << int(j))
+            self._reach = (desc, anc)
+        return self._reach
+
+    def flatCPT(self, i):
+        """Return the CPT of node i as a (messages, actions) array
+
+        :arg i: the id of a CPT-based node
+        :type i: int
+        :returns: a 2-d view of the current CPT of the node where rows are
+           indexed by ``np.dot(parentindex, strides[i])``
+
+        """
+        CPT = self.nodes[i].CPT
+        return CPT.reshape(-1, CPT.shape[-1])
+
+    def rows(self, i, valueindex):
+        """Return the flattened CPT rows of node i for a batch of samples
+
+        :arg i: the id of a CPT-based node
+        :type i: int
+        :arg valueindex: (n, size) array of valueindices
+        :type valueindex: np.array
+        :returns: an n-vector of row numbers of the flattened CPT
+
+        """
+        par = self.parents[i]
+        if len(par):
+            return np.dot(valueindex[:, par], self.strides[i])
+        else:
+            return np.zeros(valueindex.shape[0], dtype=int)
+
+    def sample(self, n):
+        """Draw n independent samples of the net
+
+        :arg n: the number of samples
+        :type n: int
+        :returns: a tuple (valueindex, contvalues). valueindex is an (n, size)
+           integer array of valueindices with columns given by the node ids.
+           Columns of continuous nodes are -1. contvalues is a dict keyed by
+           names of continuous nodes. Values are n-vectors of node values.
+
+        """
+        valueindex = -np.ones((n, self.size), dtype=int)
+        contvalues = {}
+        for level in self.levels:
+            for i in level:
+                self._draw(i, valueindex, contvalues)
+        return valueindex, contvalues
+
+    def _draw(self, i, valueindex, contvalues, rows=None):
+        """Draw node i for the rows of valueindex/contvalues in place
+
+        """
+        nod = self.nodes[i]
+        if rows is None:
+            rows = slice(None)
+        if self.isCPT[i]:
+            valueindex[rows, i] = \
+                nod._draw_CPT_rows(self.rows(i, valueindex[rows]))
+        else:
+            par = self.parents[i]
+            parvals = []
+            for j in par:
+                if self.card[j] < 0:
+                    parvals.append(contvalues[self.names[j]][rows])
+                else:
+                    parvals.append(None)
+            draws = nod.draw_batch(valueindex[rows][:, par], parvals)
+            if self.card[i] < 0:
+                if nod.name not in contvalues:
+                    contvalues[nod.name] = np.empty(valueindex.shape[0], \
+                                                    dtype=draws.dtype)
+                contvalues[nod.name][rows] = draws
+            else:
+                valueindex[rows, i] = draws
+
+    def loglike(self, valueindex, contvalues=None):
+        """Compute the log likelihood of a batch of samples of the net
+
+        :arg valueindex: (n, size) integer array of valueindices with columns
+           given by the node ids, e.g. as returned by
+           :py:meth:`gameplan.GamePlan.sample()`
+        :type valueindex: np.array
+        :arg contvalues: dict keyed by the names of continuous nodes. Values
+           are n-vectors of node values. Required if the net has continuous
+           nodes.
+        :type contvalues: dict
+        :returns: an n-vector with the log likelihood of each sample
+
+        """
+        if contvalues is None:
+            contvalues = {}
+        n = valueindex.shape[0]
+        r = np.zeros(n)
+        with np.errstate(divide='ignore'):
+            for i in xrange(self.size):
+                if self.isCPT[i]:
+                    flat = self.flatCPT(i)
+                    r += np.log(flat[self.rows(i, valueindex), valueindex[:, i]])
+                else:
+                    par = self.parents[i]
+                    parvals = [contvalues[self.names[j]] if self.card[j] < 0 \
+                               else None for j in par]
+                    if self.card[i] < 0:
+                        values = contvalues[self.names[i]]
+                    else:
+                        values = valueindex[:, i]
+                    r += self.nodes[i].logprob_batch(valueindex[:, par], \
+                                                     parvals, values)
+        return r
+
+def structure_signature(nodes):
+    """Summarize the structure of a list of nodes
+
+    :arg nodes: list of nodes
+    :type nodes: list
+    :returns: a tuple with the name, parent names, size of space and CPT flag
+       of each node.
+
+    """
+    sig = []
+    for n in nodes:
+        if n.continuous:
+            card = -1
+        else:
+            card = len(n.space)
+        sig.append((n.name, tuple(n.parents.keys()), card, \
+                    getattr(n, 'CPT', None) is not None))
+    return tuple(sig)
+
+def _bit_ids(bits):
+    """Return the positions of the set bits of an integer in increasing order
+
+    """
+    ids = []
+    while bits:
+        low = bits & -bits
+        ids.append(low.bit_length()-1)
+        bits ^= low
+    return ids
+
+def _strides(shape):
+    """Strides that map a multi-index over shape to a flat row number
+
+    """
+    strides = np.ones(len(shape), dtype=int)
+    for k in xrange(len(shape)-2, -1, -1):
+        strides[k] = strides[k+1]*shape[k+1]
+    return strides
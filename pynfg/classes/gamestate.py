@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Implements the GameState class
+
+Part of: PyNFG - a Python package for modeling and solving Network Form Games
+
+Created on Fri Oct 16 14:05:21 2026
+
+Copyright (C) 2013 James Bono
+
+GNU Affero General Public License
+
+"""
+
+from __future__ import division
+
+class GameState(object):
+    """The mutable part of a SemiNFG: values, valueindices and CPTs
+
+    A state holds references to the current CPTs of the nodes and copies of
+    their values, but none of the structure of the net, i.e. nodes, edges,
+    iterator, partitions or bn_part. Capturing and restoring a state is
+    O(number of nodes), so solvers that need to perturb a game and go back
+    to it can do so without deep copying the whole game.
+
+    :arg G: the net whose state is captured
+    :type G: SemiNFG or iterSemiNFG
+
+    CPTs are copy-on-write. Capturing a state makes the CPT arrays read-only
+    instead of copying them. The node methods that modify CPTs in place, e.g.
+    :py:meth:`classes.DecisionNode.perturbCPT()`, first call
+    :py:meth:`classes.Node.thaw_CPT()`, which replaces a read-only CPT with a
+    writeable copy. Nodes that shared the CPT when the state was restored
+    keep sharing the copy. Assigning a new CPT never touches the state.
+
+    Example::
+
+        state = G.get_state()
+        G.node_dict['D1'].perturbCPT(.5)
+        G.sample()
+        G.set_state(state) #D1 has its old CPT again and values are restored
+
+    .. warning::
+
+       Code that writes into CPT arrays directly, e.g. ``node.CPT[0] = x``,
+       gets a ValueError while a state references the array. Call
+       :py:meth:`classes.Node.thaw_CPT()` first.
+
+    Some useful methods:
+
+    * :py:meth:`gamestate.GameState.restore()`
+    * :py:meth:`gamestate.GameState.clone()`
+    * :py:meth:`gamestate.GameState.release()`
+
+    """
+    def __init__(self, G=None):
+        self.values = {}
+        self.valueindex = {}
+        self.CPTs = {}
+        self._frozen = []
+        if G is not None:
+            self.capture(G)
+
+    def capture(self, G):
+        """Capture the values, valueindices and CPTs of the nodes of G
+
+        :arg G: the net whose state is captured
+        :type G: SemiNFG or iterSemiNFG
+
+        """
+        self.values = {}
+        self.valueindex = {}
+        self.CPTs = {}
+        self._frozen = []
+        for n in G.node_dict.values():
+            if 'value' in n.__dict__:
+                self.values[n.name] = n.value
+            if 'valueindex' in n.__dict__:
+                self.valueindex[n.name] = n.valueindex
+            CPT = getattr(n, 'CPT', None)
+            if CPT is not None:
+                if CPT.flags.writeable:
+                    CPT.flags.writeable = False
+                    self._frozen.append(CPT)
+                self.CPTs[n.name] = CPT
+
+    def restore(self, G):
+        """Set the values, valueindices and CPTs of the nodes of G
+
+        Nodes whose value was not set when the state was captured lose their
+        current value.
+
+        :arg G: the net to be put in this state. It must have the nodes of
+           the net the state was captured from.
+        :type G: SemiNFG or iterSemiNFG
+
+        """
+        sharers = {}
+        for name, CPT in self.CPTs.items():
+            nod = G.node_dict[name]
+            nod.CPT = CPT
+            sharers.setdefault(id(CPT), []).append(nod)
+            nod._CPTsharers = sharers[id(CPT)]
+        for n in G.node_dict.values():
+            if n.name in self.values:
+                n.value = self.values[n.name]
+            else:
+                n.__dict__.pop('value', None)
+            if n.name in self.valueindex:
+                n.valueindex = self.valueindex[n.name]
+            else:
+                n.__dict__.pop('valueindex', None)
+
+    def release(self):
+        """Make the CPTs frozen by this state writeable again
+
+        Use when the state is no longer needed, e.g. at the end of a solver,
+        so that the CPTs of the game can be modified in place as before.
+        CPTs that were already read-only when the state was captured, e.g.
+        because another state references them, stay read-only.
+
+        """
+        for CPT in self._frozen:
+            CPT.flags.writeable = True
+        self._frozen = []
+
+    def clone(self):
+        """Return a copy of the state that shares its CPTs
+
+        :returns: a :class:`gamestate.GameState`
+
+        """
+        other = GameState()
+        other.values = dict(self.values)
+        other.valueindex = dict(self.valueindex)
+        other.CPTs = dict(self.CPTs)
+        return other
@@ -14,7 +14,6 @@ GNU Affero General Public License
 
 from __future__ import division
 import numpy as np
-import scipy as sp
 from seminfg import *
 
 class iterSemiNFG(SemiNFG):
@@ -101,7 +100,7 @@ class iterSemiNFG(SemiNFG):
         """
         self.time_partition = {}
         for n in self.iterator:
-            if n.time not in self.time_partition.keys():
+            if n.time not in self.time_partition:
                 self.time_partition[n.time] = [n]
             else:
                 self.time_partition[n.time].append(n)
@@ -118,7 +117,7 @@ class iterSemiNFG(SemiNFG):
         """
         self.bn_part = {}
         for n in self.nodes:
-            if n.basename not in self.bn_part.keys():
+            if n.basename not in self.bn_part:
                 self.bn_part[n.basename] = [n]
             else:
                 self.bn_part[n.basename].append(n)
@@ -9,6 +9,7 @@ GNU Affero General Public License
 """
 
 from collections import OrderedDict
+import numpy as np
 
 class Node(object):
     """Implements a generic node of the semi-NFG formalism created by D. Wolpert
@@ -37,11 +38,106 @@ class Node(object):
     * :py:meth:`classes.Nodes.get_CPTindex()`
 
     """
+    _CPTstamp = 0  # bumped whenever a CPT array is modified in place
+
     def __init__(self, name, parents, continuous):
         self.name = name
         self.parents = self._set_parent_dict(parents)
         self.continuous = continuous
 
+    @property
+    def CPT(self):
+        """The conditional probability table of a CPT-based node
+
+        Assigning a new array clears the cached cumulative CPT used for
+        drawing values. If the array is modified in place outside of the
+        methods of the node classes, call
+        :py:meth:`classes.Node.reset_CPTcache()` afterwards.
+
+        """
+        return self._CPT
+
+    @CPT.setter
+    def CPT(self, value):
+        self._CPT = value
+        self._CPTcache = None
+
+    def thaw_CPT(self):
+        """Make the CPT writeable before modifying it in place
+
+        A :class:`gamestate.GameState` makes the CPTs it references read-only.
+        If the CPT is read-only, it is replaced by a writeable copy, also in
+        the nodes that shared it when the state was restored. Nodes that were
+        pointed to the CPT after the state was restored keep the read-only
+        CPT, so thaw the CPT before sharing it between nodes.
+
+        :returns: the writeable CPT of the node
+
+        """
+        frozen = self.CPT
+        if not frozen.flags.writeable:
+            CPT = frozen.copy()
+            for n in getattr(self, '_CPTsharers', []):
+                if n.CPT is frozen:
+                    n.CPT = CPT
+            self.CPT = CPT
+        return self.CPT
+
+    def reset_CPTcache(self):
+        """Invalidate the cached cumulative CPTs after in-place CPT changes
+
+        Since CPT arrays may be shared by several nodes, e.g. after
+        :py:meth:`seminfg.iterSemiNFG.set_CPTs()` with basenames, the caches
+        of all nodes are invalidated. They are rebuilt lazily on the next
+        draw.
+
+        """
+        Node._CPTstamp += 1
+
+    def _cumCPT(self):
+        """Return the cached cumulative CPT of a CPT-based node
+
+        :returns: a tuple (cdf, pure, strides). cdf is the cumulative sum of
+           the CPT along the last axis, reshaped to (messages, size of space).
+           pure is a vector of the argmax values of each row if the CPT is
+           pure, and None otherwise. strides map a CPT index of parent
+           values to a row of cdf.
+
+        """
+        cache = getattr(self, '_CPTcache', None)
+        if cache is None or cache[0] != Node._CPTstamp:
+            shape = self.CPT.shape
+            flat = self.CPT.reshape(-1, shape[-1])
+            cdf = np.cumsum(flat, axis=-1)
+            pure = None
+            if np.all((flat == 0) | (flat == 1)) and np.all(cdf[:, -1] == 1):
+                pure = np.argmax(flat, axis=-1)
+            strides = [1]*(len(shape)-1)
+            for k in xrange(len(shape)-3, -1, -1):
+                strides[k] = strides[k+1]*shape[k+1]
+            cache = (Node._CPTstamp, cdf, pure, tuple(strides))
+            self._CPTcache = cache
+        return cache[1:]
+
+    def _draw_CPT_index(self, indo):
+        """Draw a valueindex from the CPT row given by a CPT index
+
+        :arg indo: a CPT index of parent values, e.g. from
+           :py:meth:`classes.Node.get_CPTindex()` with valueinput=False
+        :type indo: tuple
+        :returns: a valueindex drawn from the row. Pure rows return their
+           argmax without drawing a random number.
+
+        """
+        cdf, pure, strides = self._cumCPT()
+        row = 0
+        for k in xrange(len(indo)):
+            row += indo[k]*strides[k]
+        if pure is not None:
+            return pure[row]
+        idx = cdf[row].searchsorted(np.random.rand())
+        return min(idx, cdf.shape[1]-1)
+
     def _set_parent_dict(self, parents):
         """Set the parent OrderedDict based on the params entered by user
 
@@ -202,29 +298,204 @@ class Node(object):
            no value is provided, the current valueindex is returned.
         :returns: the index of the supplied value in the node's space
 
+        .. note::
+
+           Values are looked up in a hash index of the space, see
+           :py:meth:`classes.Node._set_space_index()`. Values without a
+           hashable form are found by scanning the space.
+
         """
         if value is None:
             return self.valueindex
+        if getattr(self, '_space_ref', None) is not self.space or \
+                len(self.space) != self._space_len:
+            self._set_space_index()
+        try:
+            return self._space_index[_canonical(value)]
+        except (KeyError, TypeError):
+            return self._scan_valueindex(value)
+
+    def _set_space_index(self):
+        """Set the hash index from values of the space to valueindices
+
+        Keys are canonical hashable forms of the elements of the space, e.g.
+        numpy arrays are keyed by their shape and entries. Elements without a
+        hashable form are left out of the index. The index is rebuilt when the
+        space attribute is replaced or changes length.
+
+        """
+        self._space_index = {}
+        self._space_ref = self.space
+        self._space_len = len(self.space)
+        for i in xrange(len(self.space)):
+            try:
+                key = _canonical(self.space[i])
+            except TypeError:
+                continue
+            if key not in self._space_index:
+                self._space_index[key] = i
+
+    def _scan_valueindex(self, value):
+        """Find the index of the value by comparing it to each space element
+
+        """
+        i = 0
+        found = False
+        while i<len(self.space) and not found:
+            try:
+                found = (self.space[i]==value).all()
+            except AttributeError:
+                found = (self.space[i]==value)
+            if found:
+                idx = i
+            else:
+                i += 1
+                found = False
+        if not found:
+            raise ValueError('the value %s is not in the space of %s' \
+                                %(str(value),self.name))
+        return idx
+
+    def draw_batch(self, parentindex, parentvalues):
+        """Draw a batch of values given a batch of parent values
+
+        This is the generic, row-by-row version used by nodes whose
+        conditional distribution cannot be evaluated on arrays. It calls
+        :py:meth:`draw_value()` once per row without setting the value.
+
+        :arg parentindex: an (n, number of parents) integer array of parent
+           valueindices in the order of the parents OrderedDict. Entries for
+           continuous parents are ignored.
+        :type parentindex: np.array
+        :arg parentvalues: one entry per parent in the order of the parents
+           OrderedDict. Entries are None for discrete parents and sequences of
+           n values for continuous parents.
+        :type parentvalues: list
+        :returns: an n-vector of valueindices if the node is discrete, and an
+           n-vector of values otherwise.
+
+        """
+        n = parentindex.shape[0]
+        columns = self._batch_parent_columns(parentindex, parentvalues)
+        names = self.parents.keys()
+        draws = []
+        for i in xrange(n):
+            parentinput = dict(zip(names, [c[i] for c in columns]))
+            draws.append(self.draw_value(parentinput, setvalue=False))
+        return self._batch_output(draws)
+
+    def _batch_parent_columns(self, parentindex, parentvalues):
+        """Convert batch parent input to one list of parent values per parent
+
+        """
+        columns = []
+        j = 0
+        for par in self.parents.values():
+            if parentvalues[j] is None:
+                columns.append([par.space[k] for k in parentindex[:, j]])
+            else:
+                columns.append(parentvalues[j])
+            j += 1
+        return columns
+
+    def _batch_output(self, draws):
+        """Convert a list of drawn values to batch output
+
+        """
+        if self.continuous:
+            out = np.empty(len(draws), dtype=object)
+            for i in xrange(len(draws)):
+                out[i] = draws[i]
+            try:
+                return out.astype(float)
+            except (TypeError, ValueError):
+                return out
         else:
-            i = 0
-            found = False
-            while i<len(self.space) and not found:
-#                if type(self.space[i])==type(value):
-                try:
-                    found = (self.space[i]==value).all()
-                except AttributeError:
-                    found = (self.space[i]==value)
-                if found:
-                    idx = i
-                else:
-                    i += 1
-                    found = False
-#                else:
-#                    i += 1
-            if not found:
-                raise ValueError('the value %s is not in the space of %s' \
-                                    %(str(value),self.name))
-            return idx
+            return np.array([self.get_valueindex(r) for r in draws], \
+                            dtype=int)
+
+    def logprob_batch(self, parentindex, parentvalues, values):
+        """Compute the conditional logprob of a batch of values
+
+        This is the generic, row-by-row version used by nodes whose
+        conditional distribution cannot be evaluated on arrays. It calls
+        :py:meth:`logprob()` once per row.
+
+        :arg parentindex: an (n, number of parents) integer array of parent
+           valueindices in the order of the parents OrderedDict. Entries for
+           continuous parents are ignored.
+        :type parentindex: np.array
+        :arg parentvalues: one entry per parent in the order of the parents
+           OrderedDict. Entries are None for discrete parents and sequences of
+           n values for continuous parents.
+        :type parentvalues: list
+        :arg values: an n-vector of valueindices if the node is discrete, and
+           an n-vector of values otherwise.
+        :type values: np.array
+        :returns: an n-vector of conditional logprobs
 
+        """
+        n = parentindex.shape[0]
+        columns = self._batch_parent_columns(parentindex, parentvalues)
+        names = self.parents.keys()
+        r = np.zeros(n)
+        for i in xrange(n):
+            parentinput = dict(zip(names, [c[i] for c in columns]))
+            if self.continuous:
+                r[i] = self.logprob(parentinput, values[i])
+            else:
+                r[i] = self.logprob(parentinput, self.space[values[i]])
+        return r
+
+    def _draw_CPT_batch(self, parentindex):
+        """Vectorized batch draw of valueindices from the CPT
+
+        :arg parentindex: an (n, number of parents) integer array of parent
+           valueindices in the order of the parents OrderedDict.
+        :type parentindex: np.array
+        :returns: an n-vector of valueindices drawn from the CPT rows
+           selected by parentindex.
+
+        """
+        strides = self._cumCPT()[2]
+        if self.parents:
+            rowindex = np.dot(parentindex, strides)
+        else:
+            rowindex = np.zeros(parentindex.shape[0], dtype=int)
+        return self._draw_CPT_rows(rowindex)
+
+    def _draw_CPT_rows(self, rowindex):
+        """Vectorized draw of valueindices from rows of the flattened CPT
 
+        :arg rowindex: an n-vector of row numbers of the CPT reshaped to
+           (number of messages, size of space)
+        :type rowindex: np.array
+        :returns: an n-vector of valueindices
 
+        """
+        cdf, pure, strides = self._cumCPT()
+        if pure is not None:
+            return pure[rowindex]
+        cutoff = np.random.rand(len(rowindex), 1)
+        idx = np.sum(cdf[rowindex] < cutoff, axis=-1)
+        return np.minimum(idx, cdf.shape[1]-1)
+
+def _canonical(value):
+    """Return a hashable key for an element of a node's space
+
+    :arg value: an element of a space, e.g. a scalar, string, tuple or numpy
+       array.
+    :returns: a hashable object. Arrays are keyed by their shape and entries,
+       so arrays with equal entries share a key regardless of dtype. Tuples
+       and lists are keyed element-wise.
+    :raises: TypeError if the value has no hashable form.
+
+    """
+    if isinstance(value, np.ndarray):
+        return (np.ndarray, value.shape, tuple(value.ravel().tolist()))
+    elif isinstance(value, tuple):
+        return (tuple, tuple([_canonical(x) for x in value]))
+    elif isinstance(value, list):
+        return (list, tuple([_canonical(x) for x in value]))
+    hash(value)
+    return value
@@ -14,11 +14,10 @@ GNU Affero General Public License
 
 from __future__ import division
 import numpy as np
-import scipy as sp
-import networkx as nx
 import inspect
-import matplotlib.pyplot as plt
 from pynfg import DecisionNode, DeterNode, ChanceNode
+from gameplan import GamePlan
+from gamestate import GameState
 
 class SemiNFG(object):
     """Implements the semi-NFG formalism created by D. Wolpert
@@ -69,6 +68,9 @@ class SemiNFG(object):
     * :py:meth:`seminfg.SemiNFG.children()`
     * :py:meth:`seminfg.SemiNFG.loglike()`
     * :py:meth:`seminfg.SemiNFG.sample()`
+    * :py:meth:`seminfg.SemiNFG.sample_batch()`
+    * :py:meth:`seminfg.SemiNFG.compile()`
+    * :py:meth:`seminfg.SemiNFG.get_state()`
     * :py:meth:`seminfg.SemiNFG.draw_graph()`
 
     Upon initialization, the following private methods are called:
@@ -106,7 +108,7 @@ class SemiNFG(object):
         """
         self.partition = {}
         for n in self.nodes:
-            if n.player not in self.partition.keys():
+            if n.player not in self.partition:
                 self.partition[n.player] = set([n])
             else:
                 self.partition[n.player].add(n)
@@ -124,28 +126,48 @@ class SemiNFG(object):
                 self.edges[par.name].add(n)
 
     def _topological_sort(self):
-        """Set the edges attribute :py:attr:`seminfg.SemiNFG.iterator`
+        """Set the attributes :py:attr:`seminfg.SemiNFG.iterator` and
+        :py:attr:`seminfg.SemiNFG.levels`
+
+        The attribute :py:attr:`seminfg.SemiNFG.levels` is a list of lists of
+        nodes. The first level holds the roots, and every other node is in the
+        level after the latest level of its parents, so the nodes of a level
+        can be drawn together once the earlier levels are drawn. Nodes in a
+        level are ordered by name.
 
         The attribute :py:attr:`seminfg.SemiNFG.iterator` is a list of the
         nodes in topological order, i.e. if a node has parents, then those
-        parents are earlier in the list than the node itself. This list is used
-        to simultate the net.
+        parents are earlier in the list than the node itself. It is the
+        concatenation of the levels. This list is used to simultate the net.
+
+        The sort is iterative (Kahn's algorithm), so its cost is linear in the
+        number of nodes and edges, and long nets do not hit the recursion
+        limit.
 
         """
+        indegree = {}
+        level = []
+        for n in self.nodes:
+            indegree[n.name] = len(n.parents)
+            if not n.parents:
+                level.append(n)
+        self.levels = []
         self.iterator = []
-        S = self.get_leaves()
-        visit_dict = dict(map(lambda x: (x.name, False), self.nodes))
-
-        def top_visit(n, top_order, visit_dict):
-            if not visit_dict[n.name]:
-                visit_dict[n.name] = True
-                for m in n.parents.values():
-                    top_order, visit_dict = top_visit(m, top_order, visit_dict)
-                top_order.append(n)
-            return top_order, visit_dict
-
-        for n in S:
-            self.iterator, visit_dict = top_visit(n, self.iterator, visit_dict)
+        while level:
+            level.sort(key=lambda nod: nod.name)
+            self.levels.append(level)
+            self.iterator.extend(level)
+            nextlevel = []
+            for n in level:
+                for kid in self.edges[n.name]:
+                    indegree[kid.name] -= 1
+                    if not indegree[kid.name]:
+                        nextlevel.append(kid)
+            level = nextlevel
+        if len(self.iterator) < len(self.nodes):
+            cycle = sorted(nam for nam in indegree if indegree[nam])
+            raise ValueError('The nodes %s are on or below a cycle' \
+                             % ', '.join(cycle))
 
     def utility(self, player, nodeinput=None):
         """Evaluate the utility of the specified player
@@ -207,35 +229,14 @@ class SemiNFG(object):
         :arg nodename: the name of the ancestor node for which descendants are
            desired.
         :type nodename: str
-        :returns: a set of nodes that are the descendants of the input node in
-           the SemiNFG object.
+        :returns: a frozenset of nodes that are the descendants of the input
+           node in the SemiNFG object.
+
+        The descendants are looked up in the reachability index of the
+        compiled plan, see :py:meth:`gameplan.GamePlan.descendants()`.
 
         """
-        visit_dict = dict(map(lambda x: (x.name, False), self.nodes))
-        future = set()
-
-        def kid_visit(n, future, visit_dict):
-            """Recursively retrieve the children, children of children, etc.
-
-            :arg n: the parent node for which children are desired.
-            :type n: :class:`nodes.ChanceNode`, :class:`nodes.DecisionNode`,
-               or :class:`nodes.DeterNode`
-            :arg future: the set of descendents, growing in recursion.
-            :type future: set
-            :arg visit_dict: keys are node names, value is True if visited
-            :type visit_dict: dict
-            :returns: updated versions of future and visit_dict
-            """
-            if not visit_dict[n.name]:
-                visit_dict[n.name] = True
-                for m in self.edges[n.name]:
-                    future, visit_dict = kid_visit(m, future, visit_dict)
-                future.add(n)
-            return future, visit_dict
-
-        for kid in self.edges[nodename]:
-            future, visit_dict = kid_visit(kid, future, visit_dict)
-        return future
+        return self._compiled().descendants(nodename)
 
     def ancestors(self, nodename):
         """Retrieve the set of ancestors of a given node.
@@ -243,35 +244,14 @@ class SemiNFG(object):
         :arg nodename: the name of the descendent node for which ancestors are
            desired.
         :type nodename: str
-        :returns: a set of nodes that are the ancestors of the input node in
-           the SemiNFG object.
+        :returns: a frozenset of nodes that are the ancestors of the input node
+           in the SemiNFG object.
+
+        The ancestors are looked up in the reachability index of the compiled
+        plan, see :py:meth:`gameplan.GamePlan.ancestors()`.
 
         """
-        visit_dict = dict(map(lambda x: (x.name, False), self.nodes))
-        past = set()
-
-        def par_visit(n, past, visit_dict):
-            """Recursively retrieve the parents, parents of parents, etc.
-
-            :arg n: the child node for which parents are desired.
-            :type n: :class:`nodes.ChanceNode`, :class:`nodes.DecisionNode`,
-               or :class:`nodes.DeterNode`
-            :arg past: the set of ancestors, growing in recursion.
-            :type past: set
-            :arg visit_dict: keys are node names, value is True if visited
-            :type visit_dict: dict
-            :returns: updated versions of past and visit_dict
-            """
-            if not visit_dict[n.name]:
-                visit_dict[n.name] = True
-                for m in n.parents.values():
-                    past, visit_dict = par_visit(m, past, visit_dict)
-                past.add(n)
-            return past, visit_dict
-
-        for par in self.node_dict[nodename].parents.values():
-            past, visit_dict = par_visit(par, past, visit_dict)
-        return past
+        return self._compiled().ancestors(nodename)
 
     def get_leaves(self):
         """Retrieve the leaves of the SemiNFG.
@@ -352,6 +332,26 @@ class SemiNFG(object):
         for name in cptdict.keys():
             self.node_dict[name].CPT = cptdict[name]
 
+    def get_state(self):
+        """Capture the values and CPTs of the nodes in the SemiNFG
+
+        :returns: a :class:`gamestate.GameState` that shares the CPTs with
+           the SemiNFG. The CPTs become copy-on-write. Use
+           :py:meth:`seminfg.SemiNFG.set_state()` to return to the state
+           instead of deep copying the SemiNFG.
+
+        """
+        return GameState(self)
+
+    def set_state(self, state):
+        """Set the values and CPTs of the nodes to a captured state
+
+        :arg state: a state captured from this SemiNFG
+        :type state: :class:`gamestate.GameState`
+
+        """
+        state.restore(self)
+
     def set_values(self, value_dict):
         """Set the values of a subset of the nodes comprising the SemiNFG.
 
@@ -434,29 +434,73 @@ class SemiNFG(object):
 
            The decision nodes must have CPTs before using this function.
 
+        The nodes to draw for each combination of start and exclude are
+        computed once and cached with the compiled plan of the net, see
+        :py:meth:`gameplan.GamePlan.resample_order()`.
+
         """
-        if not exclude:
-            exclude = []
-        if not start:
-            for n in self.iterator:
-                if n.name not in exclude:
-                    n.draw_value()
-        else:
-            children = set()
-            starters = set([self.node_dict[nam] for nam in start])
-            for nam in start:
-                children.update(self.descendants(nam))
-            for n in self.iterator:
-                if n in children.union(starters):
-                    if n.name not in exclude:
-                        n.draw_value()
+        for n in self._compiled().resample_order(start, exclude):
+            n.draw_value()
         if nodenames:
             outdict = dict(zip(nodenames, [self.node_dict[x].get_value() for \
                                             x in nodenames]))
             return outdict
-        else:
-            outdict = self.get_values()
 
+    def sample_batch(self, n):
+        """Draw n independent samples of the net at once.
+
+        :arg n: the number of samples to draw
+        :type n: int
+        :returns: a tuple (valueindex, contvalues). valueindex is an (n, number
+           of nodes) integer array of valueindices whose columns follow the
+           order of :py:attr:`seminfg.SemiNFG.iterator`. Columns of continuous
+           nodes are -1. contvalues is a dict keyed by the names of continuous
+           nodes. Values are n-vectors of the values of those nodes.
+
+        CPT-based nodes are drawn for the whole batch at once by indexing the
+        CPT with the columns of the parents. Other nodes are evaluated row by
+        row. The current values of the nodes are not changed. The sampling is
+        done by the compiled plan of the net, see
+        :py:meth:`seminfg.SemiNFG.compile()`.
+
+        .. warning::
+
+           The decision nodes must have CPTs before using this function.
+
+        """
+        plan = self._compiled()
+        for i in np.flatnonzero(plan.isCPT):
+            if not plan.nodes[i].CPT.any():
+                raise AttributeError('CPT for %s is just a zeros array' \
+                                     % plan.names[i])
+        return plan.sample(n)
+
+    def compile(self):
+        """Compile the topology of the net into a :class:`gameplan.GamePlan`
+
+        :returns: the compiled plan of the net. The plan assigns each node an
+           integer id, stores integer arrays of parent ids and the strides of
+           the flattened CPTs. It provides fast batch sampling and likelihood
+           evaluation.
+
+        The plan is stored and reused. It is only rebuilt when the structure
+        of the net changes, i.e. the names, parents or spaces of the nodes.
+        Changing CPTs does not require a new plan.
+
+        """
+        plan = getattr(self, '_plan', None)
+        if plan is None or not plan.matches(self.iterator):
+            self._plan = GamePlan(self)
+        return self._plan
+
+    def _compiled(self):
+        """Return the stored plan without checking the structure
+
+        """
+        plan = getattr(self, '_plan', None)
+        if plan is None:
+            plan = self.compile()
+        return plan
 
     def draw_graph(self, subgraph=None):
         """Draw the DAG representing the topology of the SemiNFG.
@@ -472,6 +516,8 @@ class SemiNFG(object):
            :py:mod:`networkx` packages.
 
         """
+        import networkx as nx
+        import matplotlib.pyplot as plt
         G = nx.DiGraph()
         if not subgraph:
             nodelist = self.node_dict.values()
@@ -129,18 +129,23 @@ class BestResponse(object):
 
         """
         print 'Training ' + nodename + ' at level ' + str(level)
-        Game = copy.deepcopy(self.Game)  # copy in order to maintain original CPT
+        Game = self.Game
+        state = Game.get_state()  # restored below to maintain original CPT
         ps = self.specs
-        for node in Game.node_dict.values():  # Game changes, self.Game doesn't
-            if type(node) is pynfg.DecisionNode:
-                try:
-                    node.CPT = node.LevelCPT[level - 1]
-                except KeyError:
-                    raise KeyError('Need to train other players at level %s'
-                                   % str(level-1))
-        EUtable = mceu(Game, nodename, Game.node_dict[nodename].N,
-                       Game.node_dict[nodename].tol, Game.node_dict[nodename].delta,
-                       verbose=verbose)
+        try:
+            for node in Game.node_dict.values():
+                if type(node) is pynfg.DecisionNode:
+                    try:
+                        node.CPT = node.LevelCPT[level - 1]
+                    except KeyError:
+                        raise KeyError('Need to train other players at level %s'
+                                       % str(level-1))
+            EUtable = mceu(Game, nodename, Game.node_dict[nodename].N,
+                           Game.node_dict[nodename].tol,
+                           Game.node_dict[nodename].delta, verbose=verbose)
+        finally:
+            Game.set_state(state)
+            state.release()
         if not logit:
             self.Game.node_dict[nodename].LevelCPT[level] = \
                   convert_2_pureCPT(EUtable)
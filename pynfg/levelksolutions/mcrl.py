@@ -13,7 +13,6 @@ from __future__ import division
 import time
 import copy
 import numpy as np
-import matplotlib.pylab as plt
 from pynfg.utilities.utilities import iterated_input_dict
 import warnings
 import sys
@@ -99,7 +98,8 @@ class EWMA_MCRL(object):
         sys.stdout.write('\r')
         print 'Training ' + bn + ' at level '+ str(level)
         specs = self.specs
-        Game = copy.deepcopy(self.Game)
+        Game = self.Game
+        state = Game.get_state()  # restored after training
         player = Game.bn_part[bn][0].player
         basedict = specs[player][bn]
         J, N, alpha, delta, eps, pureout = basedict['J'], basedict['N'], \
@@ -129,6 +129,7 @@ class EWMA_MCRL(object):
         T = Game.endtime+1
         shape = Game.bn_part[bn][0].CPT.shape
         shape_last = shape[-1]
+        Game.bn_part[bn][0].thaw_CPT()  # the policy is updated in place
         for dn in Game.bn_part[bn]:  # pointing all CPTs to T0, i.e. single policy
             dn.CPT = Game.bn_part[bn][0].CPT
         visit = set()  # dict of the messages and mapairs visited throughout training
@@ -222,18 +223,22 @@ class EWMA_MCRL(object):
             # for each mapair shift only eps% of the percent shift
             updater = eps[n]*indicaten*Game.bn_part[bn][0].CPT/shiftnorm
             # increment the CPT
-            Game.bn_part[bn][0].CPT[idx] += updater[idx]*shift[idx]
+            CPT = Game.bn_part[bn][0].thaw_CPT()
+            CPT[idx] += updater[idx]*shift[idx]
             # normalize after the shift
-            CPTsum = Game.bn_part[bn][0].CPT.sum(axis=-1)
-            Game.bn_part[bn][0].CPT /= CPTsum[...,np.newaxis]
+            CPTsum = CPT.sum(axis=-1)
+            CPT /= CPTsum[...,np.newaxis]
+            Game.bn_part[bn][0].reset_CPTcache()
         if pureout: #if True, output is a pure policy
             Game.bn_part[bn][0].makeCPTpure()
-        self.trained_CPTs[player][bn][level] = Game.bn_part[bn][0].CPT
+        trained = Game.bn_part[bn][0].CPT
+        self.trained_CPTs[player][bn][level] = trained
+        Game.set_state(state)
+        state.release()
         if setCPT:
             for node in self.Game.bn_part[bn]:
-                node.CPT = Game.bn_part[bn][0].CPT
-        for tau in xrange(1, T-T0): #before exit, make CPTs independent in memory
-            Game.bn_part[bn][tau].CPT = copy.copy(Game.bn_part[bn][0].CPT)
+                node.CPT = trained
+        import matplotlib.pylab as plt
         plt.figure()
         plt.plot(Rseries, label = str(bn + ' Level ' + str(level)))
         #plotting rseries to gauge convergence
@@ -14,7 +14,6 @@ Author: Dongping Xie
 
 from __future__ import division
 import numpy as np
-import matplotlib.pylab as plt
 from pynfg.utilities.utilities import convert_2_pureCPT, iterated_input_dict
 import copy
 import warnings
@@ -91,7 +90,8 @@ class QLearning(object):
         """
 
         print 'Training ' + bn + ' at level '+ str(level)
-        Game = copy.deepcopy(self.Game)
+        Game = self.Game
+        state = Game.get_state()  # restored after training
         ps = self.specs
         player = Game.bn_part[bn][0].player
         w, d, N, r_max = ps[player]['w'], ps[player]['delta'], ps[player][bn]['N'], \
@@ -150,7 +150,11 @@ class QLearning(object):
                 Qmax = Qmax_new
                 r_av = r_av_new
             rseries.append(r_av)
-        self.trained_CPTs[player][bn][level] = Game.bn_part[bn][0].CPT
+        trained = Game.bn_part[bn][0].CPT
+        self.trained_CPTs[player][bn][level] = trained
+        Game.set_state(state)
+        state.release()
+        import matplotlib.pylab as plt
         plt.figure()
         plt.plot(rseries, label = str(bn + ' Level ' + str(level)))
         #plotting rseries to gauge convergence
@@ -158,7 +162,7 @@ class QLearning(object):
         fig = plt.gcf()
         self.figs[bn][str(level)] = fig
         if setCPT:
-            map(lambda x: _setallCPTs(self.Game,bn, x, Game.bn_part[bn][0].CPT), np.arange(T0, T))
+            map(lambda x: _setallCPTs(self.Game,bn, x, trained), np.arange(T0, T))
 
 
     def solve_game(self, setCPT=False):
@@ -205,7 +205,8 @@ class RLK(object):
                     satis_set.append((list(sdist)))
 
             for sdraw in satis_set:  # For each SDist
-                node.CPT[ix] = sdraw
+                node.thaw_CPT()[ix] = sdraw
+                node.reset_CPTcache()
                 node.draw_value()  # set CPT and draw
                 weu = []
                 for y in Y_vals:
@@ -234,7 +235,7 @@ class RLK(object):
         """ Returns a list with length Mprime
         whose elements are a dictionary of samples of nodes.
         """
-        Game = copy.deepcopy(self.Game)
+        Game = self.Game  # values are drawn with setvalue=False
         set_dicts = []
         for i in range(Mprime):
             set_samp = {}
@@ -12,7 +12,7 @@ GNU Affero General Public License
 from __future__ import division
 import copy
 import numpy as np
-from pynfg import DecisionNode, iterSemiNFG
+from pynfg import DecisionNode, iterSemiNFG, GameState
 from pynfg.utilities.utilities import mh_decision
 import sys
 
@@ -90,11 +90,15 @@ def coordinated_MC(G, S, noise, X, M, innoise=1, delta=1, integrand=None, \
     weight = {}
     w = {}
     funcout = {} #keys are s in S, vals are eval of integrand of G(s)
+    base = G.get_state() #G is restored to base instead of copied
+    if satisfice:
+        satisfice = satisfice.get_state()
     for s in xrange(1, S+1): #sampling S policy profiles
         sys.stdout.write('\r')
         sys.stdout.write('MC Sample ' + str(s))
         sys.stdout.flush()
-        GG = copy.deepcopy(G)
+        G.set_state(base)
+        GG = G
         for p in GG.players:
             w[p] = 1
             for dn in GG.partition[p]: #drawing current policy
@@ -106,6 +110,10 @@ def coordinated_MC(G, S, noise, X, M, innoise=1, delta=1, integrand=None, \
             funcout[s] = integrand(GG) #eval integrand G(s), assign to funcout
         intel[s] = copy.deepcopy(iq)
         weight[s] = copy.deepcopy(w)
+    G.set_state(base)
+    base.release()
+    if satisfice:
+        satisfice.release()
     return intel, funcout, weight
 
 def coordinated_MH(G, S, density, noise, X, M, innoise=1, delta=1, \
@@ -189,11 +197,16 @@ def coordinated_MH(G, S, density, noise, X, M, innoise=1, delta=1, \
     iq = {} #keys are base names, iq timestep series
     funcout = {} #keys are s in S, vals are eval of integrand of G(s)
     dens = np.zeros(S+1) #storing densities for return
+    base = G.get_state() #G is restored to a state instead of copied
+    current = base
+    if satisfice:
+        satisfice = satisfice.get_state()
     for s in xrange(1, S+1): #sampling S sequences of policy profiles
         sys.stdout.write('\r')
         sys.stdout.write('MH Sample ' + str(s))
         sys.stdout.flush()
-        GG = copy.deepcopy(G)
+        G.set_state(current)
+        GG = G
         for p in GG.players:
             for dn in GG.partition[p]: #drawing current policy
                 dn.perturbCPT(noise, mixed=mix)
@@ -205,13 +218,18 @@ def coordinated_MH(G, S, density, noise, X, M, innoise=1, delta=1, \
         verdict = mh_decision(current_dens, dens[s-1])
         if verdict: #accepting new CPT
             intel[s] = copy.deepcopy(iq)
-            G = copy.deepcopy(GG)
+            current = GG.get_state()
             dens[s] = current_dens
         else:
             intel[s] = intel[s-1]
             dens[s] = dens[s-1]
         if integrand is not None:
+            G.set_state(current)
             funcout[s] = integrand(G) #eval integrand G(s), assign to funcout
+    G.set_state(base)
+    base.release()
+    if satisfice:
+        satisfice.release()
     return intel, funcout, dens[1::]
 
 def coordinated_calciq(p, G, X, M, mix, delta, innoise, satisfice=None):
@@ -233,8 +251,9 @@ def coordinated_calciq(p, G, X, M, mix, delta, innoise, satisfice=None):
     :arg innoise: the perturbation noise for the inner loop to draw alt CPTs
     :type innoise: float
     :arg satisfice: game G such that the CPTs of G together with innoise
-       determine the intelligence satisficing distribution.
-    :type satisfice: SemiNFG or iterSemiNFG
+       determine the intelligence satisficing distribution, or a state of
+       such a game.
+    :type satisfice: SemiNFG or iterSemiNFG or GameState
     :returns: an estimate of the fraction of alternative strategies that yield
        lower expected utility than the current policy.
 
@@ -248,12 +267,17 @@ def coordinated_calciq(p, G, X, M, mix, delta, innoise, satisfice=None):
         uargs = [p, G.starttime, delta]
     except AttributeError:
         ufoo = G.utility
-        uargs = p
+        uargs = [p]
     for x in xrange(1,X+1):
         G.sample()
         util = (ufoo(*uargs)+(x-1)*util)/x
     if satisfice: #using the satisficing distribution for drawing alternatives
-        G = copy.deepcopy(satisfice)
+        policy = G.get_state()
+        if isinstance(satisfice, GameState):
+            sat = satisfice
+        else:
+            sat = satisfice.get_state()
+        G.set_state(sat)
     cptdict = G.get_decisionCPTs()
     smalldict = {dn.name: cptdict[dn.name] for dn in G.partition[p]}
     for m in range(M): #Sample M alt policies for the player
@@ -274,6 +298,11 @@ def coordinated_calciq(p, G, X, M, mix, delta, innoise, satisfice=None):
             altutil[m] = G.npv_reward(p, G.starttime, delta)
         else:
             altutil[m] = G.utility(p)
+    if satisfice: #back to the policy being evaluated
+        G.set_state(policy)
+        policy.release()
+        if sat is not satisfice:
+            sat.release()
     #weight of alts worse than G
     worse = [weight[m] for m in range(M) if altutil[m]<util]
     return np.sum(worse)/np.sum(weight) #fraction of alts worse than G is IQ
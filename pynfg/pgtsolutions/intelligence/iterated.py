@@ -12,9 +12,8 @@ GNU Affero General Public License
 from __future__ import division
 import copy
 import numpy as np
-from pynfg import DecisionNode
+from pynfg import DecisionNode, GameState
 from pynfg.utilities.utilities import mh_decision
-import scipy.stats.distributions as randvars
 import sys
 
 def iterated_MC(G, S, noise, X, M, innoise=1, delta=1, integrand=None, \
@@ -103,11 +102,15 @@ def iterated_MC(G, S, noise, X, M, innoise=1, delta=1, integrand=None, \
     weight = {} #keys are s in S, vals are bn-keyed dicts of importance weights
     for bn in bnlist: #preallocating iq dict entries
         iq[bn] = np.zeros(T-T0+1)
+    base = G.get_state() #G is restored to base instead of copied
+    if satisfice:
+        satisfice = satisfice.get_state()
     for s in xrange(1, S+1): #sampling S sequences of policy profiles
         sys.stdout.write('\r')
         sys.stdout.write('MC Sample ' + str(s))
         sys.stdout.flush()
-        GG = copy.deepcopy(G)
+        G.set_state(base)
+        GG = G
         w = dict(zip(bnlist, np.ones(len(bnlist)))) #mapping bn to IS weights
         for t in xrange(T0, T+1): #sampling a sequence of policy profiles
             # gather list of decision nodes in time tout
@@ -123,6 +126,10 @@ def iterated_MC(G, S, noise, X, M, innoise=1, delta=1, integrand=None, \
             funcout[s] = integrand(GG) #eval integrand G(s), assign to funcout
         intel[s] = copy.deepcopy(iq)
         weight[s] = copy.deepcopy(w)
+    G.set_state(base)
+    base.release()
+    if satisfice:
+        satisfice.release()
     return intel, funcout, weight
 
 def iterated_MH(G, S, density, noise, X, M, innoise=1, delta=1, \
@@ -220,31 +227,41 @@ def iterated_MH(G, S, density, noise, X, M, innoise=1, delta=1, \
     funcout = {} #keys are s in S, vals are eval of integrand of G(s)
     dens = np.zeros(S+1)
     # gather list of decision nodes in base game
+    base = G.get_state() #G is restored to a state instead of copied
+    current = base
+    if satisfice:
+        satisfice = satisfice.get_state()
     for s in xrange(1, S+1): #sampling S sequences of policy profiles
         sys.stdout.write('\r')
         sys.stdout.write('MH Sample ' + str(s))
         sys.stdout.flush()
-        GG = copy.deepcopy(G)
+        G.set_state(current)
+        GG = G
         for t in xrange(T0, T+1):
             for dn in dnlist:
-                GG.bn_part[dn][t-T0].CPT = G.bn_part[dn][t-T0].perturbCPT(\
-                                            noise, mixed=mix)
+                GG.bn_part[dn][t-T0].CPT = GG.bn_part[dn][t-T0].perturbCPT(\
+                                            noise, mixed=mix, setCPT=False)
                 for dd in GG.bn_part[dn][t-T0+1::]:
                     dd.CPT = GG.bn_part[dn][t-T0].CPT #apply policy to future
-                iq[dn][t-T0] = iterated_calciq(dn, G, X, M, mix, delta, t, \
+                iq[dn][t-T0] = iterated_calciq(dn, GG, X, M, mix, delta, t, \
                                                innoise, satisfice=None) #getting iq
         # The MH decision
         current_dens = density(iq) #evaluating density of current draw's iq
         verdict = mh_decision(current_dens, dens[s-1]) #True if accept new draw
         if verdict: #accepting new CPT
             intel[s] = copy.deepcopy(iq)
-            G = copy.deepcopy(GG)
+            current = GG.get_state()
             dens[s] = current_dens
         else:
             intel[s] = intel[s-1]
             dens[s] = dens[s-1]
         if integrand is not None:
+            G.set_state(current)
             funcout[s] = integrand(G) #eval integrand G(s), assign to funcout
+    G.set_state(base)
+    base.release()
+    if satisfice:
+        satisfice.release()
     return intel, funcout, dens[1::]
 
 def iterated_calciq(bn, G, X, M, mix, delta, start, innoise, satisfice=None):
@@ -266,8 +283,9 @@ def iterated_calciq(bn, G, X, M, mix, delta, start, innoise, satisfice=None):
     :arg innoise: the perturbation noise for the inner loop to draw alt CPTs
     :type innoise: float
     :arg satisfice: game G such that the CPTs of G together with innoise
-       determine the intelligence satisficing distribution.
-    :type satisfice: iterSemiNFG
+       determine the intelligence satisficing distribution, or a state of
+       such a game.
+    :type satisfice: iterSemiNFG or GameState
     :returns: an estimate of the fraction of alternative policies at the given
        time step that have a lower npv reward than the current policy.
 
@@ -283,7 +301,12 @@ def iterated_calciq(bn, G, X, M, mix, delta, start, innoise, satisfice=None):
         G.sample()
         util += G.npv_reward(p,start,delta)/X
     if satisfice: #using the satisficing distribution for drawing alternatives
-        G = copy.deepcopy(satisfice)
+        policy = G.get_state()
+        if isinstance(satisfice, GameState):
+            sat = satisfice
+        else:
+            sat = satisfice.get_state()
+        G.set_state(sat)
     cptdict = G.get_decisionCPTs()
     smalldict = {name: cptdict[name] for name in bnlist}
     for m in range(M): #Sample M alt policies for the player
@@ -304,6 +327,11 @@ def iterated_calciq(bn, G, X, M, mix, delta, start, innoise, satisfice=None):
             dn.CPT = G.bn_part[bn][start-T0].CPT
         G.sample_timesteps(T0) #sample altpolicy prof. to end of net
         altutil[m] = G.npv_reward(p, start, delta)
+    if satisfice: #back to the policy being evaluated
+        G.set_state(policy)
+        policy.release()
+        if sat is not satisfice:
+            sat.release()
     #weight of alts worse than G
     worse = [weight[m] for m in range(M) if altutil[m]<util]
     return np.sum(worse)/np.sum(weight) #fraction of alts worse than G is IQ
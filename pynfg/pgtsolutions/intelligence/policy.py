@@ -13,7 +13,7 @@ GNU Affero General Public License
 from __future__ import division
 import copy
 import numpy as np
-from pynfg import DecisionNode, iterSemiNFG
+from pynfg import DecisionNode, iterSemiNFG, GameState
 from pynfg.utilities.utilities import mh_decision
 import sys
 
@@ -102,11 +102,15 @@ def policy_MC(G, S, noise, X, M, innoise=1, delta=1, integrand=None, \
     T0 = G.starttime
     for p in G.players: #getting player-keyed dict of basenames
         bndict[p] = [x.basename for x in G.partition[p] if x.time==T0]
+    base = G.get_state() #G is restored to base instead of copied
+    if satisfice:
+        satisfice = satisfice.get_state()
     for s in xrange(1, S+1): #sampling S policy profiles
         sys.stdout.write('\r')
         sys.stdout.write('MC Sample ' + str(s))
         sys.stdout.flush()
-        GG = copy.deepcopy(G)
+        G.set_state(base)
+        GG = G
         for p in G.players:
             w[p] = 1
             for bn in bndict[p]: #getting importance weights for each player
@@ -120,6 +124,10 @@ def policy_MC(G, S, noise, X, M, innoise=1, delta=1, integrand=None, \
             funcout[s] = integrand(GG) #eval integrand G(s), assign to funcout
         intel[s] = copy.deepcopy(iq)
         weight[s] = copy.deepcopy(w)
+    G.set_state(base)
+    base.release()
+    if satisfice:
+        satisfice.release()
     return intel, funcout, weight
 
 def policy_MH(G, S, density, noise, X, M, innoise=1, delta=1, \
@@ -214,11 +222,16 @@ def policy_MH(G, S, density, noise, X, M, innoise=1, delta=1, \
     T0 = G.starttime
     for p in G.players: #getting player-keyed dict of basenames
         bndict[p] = [x.basename for x in G.partition[p] if x.time==T0]
+    base = G.get_state() #G is restored to a state instead of copied
+    current = base
+    if satisfice:
+        satisfice = satisfice.get_state()
     for s in xrange(1, S+1): #sampling S sequences of policy profiles
         sys.stdout.write('\r')
         sys.stdout.write('MH Sample ' + str(s))
         sys.stdout.flush()
-        GG = copy.deepcopy(G)
+        G.set_state(current)
+        GG = G
         for p in G.players: #taking the new MH draw
             for bn in bndict[p]:
                 GG.bn_part[bn][0].perturbCPT(noise, mixed=mix)
@@ -231,13 +244,18 @@ def policy_MH(G, S, density, noise, X, M, innoise=1, delta=1, \
         verdict = mh_decision(current_dens, dens[s-1]) #True if accept new draw
         if verdict: #accepting new CPT
             intel[s] = copy.deepcopy(iq)
-            G = copy.deepcopy(GG)
+            current = GG.get_state()
             dens[s] = current_dens
         else:
             intel[s] = intel[s-1]
             dens[s] = dens[s-1]
         if integrand is not None:
+            G.set_state(current)
             funcout[s] = integrand(G) #eval integrand G(s), assign to funcout
+    G.set_state(base)
+    base.release()
+    if satisfice:
+        satisfice.release()
     return intel, funcout, dens[1::]
 
 def policy_calciq(p, G, X, M, mix, delta, innoise, satisfice=None):
@@ -259,8 +277,9 @@ def policy_calciq(p, G, X, M, mix, delta, innoise, satisfice=None):
     :arg innoise: the perturbation noise for the inner loop to draw alt CPTs
     :type innoise: float
     :arg satisfice: game G such that the CPTs of G together with innoise
-       determine the intelligence satisficing distribution.
-    :type satisfice: iterSemiNFG
+       determine the intelligence satisficing distribution, or a state of
+       such a game.
+    :type satisfice: iterSemiNFG or GameState
     :returns: an estimate of the fraction of alternative policies that have a
        lower npv reward than the current policy.
 
@@ -275,7 +294,12 @@ def policy_calciq(p, G, X, M, mix, delta, innoise, satisfice=None):
         G.sample()
         util += G.npv_reward(p,G.starttime,delta)/X
     if satisfice: #using the satisficing distribution for drawing alternatives
-        G = copy.deepcopy(satisfice)
+        policy = G.get_state()
+        if isinstance(satisfice, GameState):
+            sat = satisfice
+        else:
+            sat = satisfice.get_state()
+        G.set_state(sat)
     cptdict = G.get_decisionCPTs(mode='basename')
     smalldict = {key: cptdict[key] for key in bnlist}
     for m in range(M): #Sample M alt policies for the player
@@ -299,6 +323,11 @@ def policy_calciq(p, G, X, M, mix, delta, innoise, satisfice=None):
                 dn.CPT = G.bn_part[bn][0].CPT
         G.sample() #sample altpolicy prof. to end of net
         altutil[m] = G.npv_reward(p, G.starttime, delta)
+    if satisfice: #back to the policy being evaluated
+        G.set_state(policy)
+        policy.release()
+        if sat is not satisfice:
+            sat.release()
     #weight of alts worse than G
     worse = [weight[m] for m in range(M) if altutil[m]<util]
     return np.sum(worse)/np.sum(weight) #fraction of alts worse than G is IQ
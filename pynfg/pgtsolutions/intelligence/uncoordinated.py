@@ -13,8 +13,7 @@ from __future__ import division
 import copy
 import numpy as np
 from pynfg import DecisionNode
-from pynfg import iterSemiNFG
-import scipy.stats.distributions as randvars
+from pynfg import iterSemiNFG, GameState
 from pynfg.utilities.utilities import mh_decision
 import sys
 
@@ -95,11 +94,15 @@ def uncoordinated_MC(G, S, noise, X, M, innoise, delta=1, integrand=None, \
     funcout = {} #keys are s in S, vals are eval of integrand of G(s)
     w = {}
     weight = {}
+    base = G.get_state() #G is restored to base instead of copied
+    if satisfice:
+        satisfice = satisfice.get_state()
     for s in xrange(1, S+1): #sampling S sequences of policy profiles
         sys.stdout.write('\r')
         sys.stdout.write('MC Sample ' + str(s))
         sys.stdout.flush()
-        GG = copy.deepcopy(G)
+        G.set_state(base)
+        GG = G
         for dn in dnlist: #drawing current policy
             w[dn] = GG.node_dict[dn].perturbCPT(noise, mixed=mix, \
                                                 returnweight=True)
@@ -110,6 +113,10 @@ def uncoordinated_MC(G, S, noise, X, M, innoise, delta=1, integrand=None, \
             funcout[s] = integrand(GG) #eval integrand GG(s), assign to funcout
         intel[s] = copy.deepcopy(iq)
         weight[s] = copy.deepcopy(w)
+    G.set_state(base)
+    base.release()
+    if satisfice:
+        satisfice.release()
     return intel, funcout, weight
 
 def uncoordinated_MH(G, S, density, noise, X, M, innoise=1, delta=1, \
@@ -197,11 +204,16 @@ def uncoordinated_MH(G, S, density, noise, X, M, innoise=1, delta=1, \
     iq = {} #keys are base names, iq timestep series
     funcout = {} #keys are s in S, vals are eval of integrand of G(s)
     dens = np.zeros(S+1) #storing densities for return
+    base = G.get_state() #G is restored to a state instead of copied
+    current = base
+    if satisfice:
+        satisfice = satisfice.get_state()
     for s in xrange(1, S+1): #sampling S sequences of policy profiles
         sys.stdout.write('\r')
         sys.stdout.write('MH Sample ' + str(s))
         sys.stdout.flush()
-        GG = copy.deepcopy(G)
+        G.set_state(current)
+        GG = G
         for dn in dnlist:
             GG.node_dict[dn].perturbCPT(noise, mixed=mix)
         for dn in dnlist:#getting iq
@@ -212,13 +224,17 @@ def uncoordinated_MH(G, S, density, noise, X, M, innoise=1, delta=1, \
         verdict = mh_decision(current_dens, dens[s-1])
         if verdict: #accepting new CPT
             intel[s] = copy.deepcopy(iq)
-            G = copy.deepcopy(GG)
+            current = GG.get_state()
             dens[s] = current_dens
         else:
             intel[s] = intel[s-1]
             dens[s] = dens[s-1]
         if integrand is not None:
             funcout[s] = integrand(GG) #eval integrand G(s), assign to funcout
+    G.set_state(base)
+    base.release()
+    if satisfice:
+        satisfice.release()
     return intel, funcout, dens[1::]
 
 def uncoordinated_calciq(dn, G, X, M, mix, delta, innoise, satisfice=None):
@@ -240,8 +256,9 @@ def uncoordinated_calciq(dn, G, X, M, mix, delta, innoise, satisfice=None):
     :arg innoise: the perturbation noise for the inner loop to draw alt CPTs
     :type innoise: float
     :arg satisfice: game G such that the CPTs of G together with innoise
-       determine the intelligence satisficing distribution.
-    :type satisfice: SemiNFG or iterSemiNFG
+       determine the intelligence satisficing distribution, or a state of
+       such a game.
+    :type satisfice: SemiNFG or iterSemiNFG or GameState
     :returns: an estimate of the fraction of alternative strategies that yield
        lower expected utility than the current policy.
 
@@ -262,7 +279,12 @@ def uncoordinated_calciq(dn, G, X, M, mix, delta, innoise, satisfice=None):
         G.sample()
         util = (ufoo(*uargs)+(x-1)*util)/x
     if satisfice: #using the satisficing distribution for drawing alternatives
-        G = copy.deepcopy(satisfice)
+        policy = G.get_state()
+        if isinstance(satisfice, GameState):
+            sat = satisfice
+        else:
+            sat = satisfice.get_state()
+        G.set_state(sat)
     oldcpt = G.bn_part[dn].CPT
     for m in range(M): #Sample M alt CPTs for the player at the DN
         G.bn_part[dn].CPT = oldcpt
@@ -282,6 +304,11 @@ def uncoordinated_calciq(dn, G, X, M, mix, delta, innoise, satisfice=None):
         except AttributeError:
             altutil[m] = G.utility(p)
         G.node_dict[dn].CPT = oldCPT #resetting the CPT for the next draw
+    if satisfice: #back to the policy being evaluated
+        G.set_state(policy)
+        policy.release()
+        if sat is not satisfice:
+            sat.release()
     #weight of alts worse than G
     worse = [weight[m] for m in range(M) if altutil[m]<util]
     return np.sum(worse)/np.sum(weight) #fraction of alts worse than G is IQ
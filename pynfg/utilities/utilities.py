@@ -12,8 +12,8 @@ GNU Affero General Public License
 
 """
 from __future__ import division
+import inspect
 import numpy as np
-import copy
 import pynfg
 
 def mceu(Game, dn, N, tol=30, delta=1, verbose=False):
@@ -28,14 +28,21 @@ def mceu(Game, dn, N, tol=30, delta=1, verbose=False):
     :arg tol: the minimum number of samples per parent value
     :type tol: int
 
+    The values of the nodes of Game are restored before returning.
+
     """
-    if type(Game) == pynfg.classes.seminfg.SemiNFG:
-        return _mceu_static(Game, dn, N, tol, verbose)
-    else:
-        return _mceu_iterated(Game, dn, N, tol, delta,  verbose)
+    state = Game.get_state()
+    try:
+        if type(Game) == pynfg.classes.seminfg.SemiNFG:
+            return _mceu_static(Game, dn, N, tol, verbose)
+        else:
+            return _mceu_iterated(Game, dn, N, tol, delta,  verbose)
+    finally:
+        Game.set_state(state)
+        state.release()
 
 def _mceu_iterated(Game, dn, N, tol=30, delta=1, verbose=False):
-    G = copy.deepcopy(Game)
+    G = Game
     player = G.node_dict[dn].player
     CPT_shape = G.node_dict[dn].CPT.shape
     non_children_nodes = list(set(G.node_dict.values()) - set(G.children(dn)))
@@ -44,9 +51,8 @@ def _mceu_iterated(Game, dn, N, tol=30, delta=1, verbose=False):
     Utable = np.zeros(CPT_shape)
     visits = np.zeros(CPT_shape)
     n = 0
-    try:
-        ufoo = G.npv_reward
-        uargs = [player, G.node_dict[dn].time, delta]
+    ufoo = G.npv_reward
+    uargs = [player, G.node_dict[dn].time, delta]
     while  np.min(visits)<tol or n>N:
         n += 1
         G.sample()
@@ -69,6 +75,7 @@ def _mceu_iterated(Game, dn, N, tol=30, delta=1, verbose=False):
     return Utable/np.float_(visits)
 
 def _mceu_static(Game, dn, N, tol, verbose=False):
+    G = Game
     player = G.node_dict[dn].player
     CPT_shape = G.node_dict[dn].CPT.shape
     childnames = [node.name for node in G.children(dn)]
@@ -106,6 +113,104 @@ def _mceu_static(Game, dn, N, tol, verbose=False):
     return Utable/visits
 
 
+def mceu_batch(Game, dn, N, tol=30, delta=1, verbose=False, batch=1000):
+    """Compute the move-conditioned expected utilities with batched sampling
+
+    A vectorized alternative to :py:func:`utilities.mceu` with the same
+    arguments and return value. Worlds are drawn in batches with
+    :py:meth:`seminfg.SemiNFG.sample_batch()`. Each world is replicated once
+    per action of the decision node, the nodes affected by the action are
+    redrawn for the whole batch at once, and the utilities are accumulated
+    with :py:func:`numpy.add.at`.
+
+    :arg Game: the SemiNFG of interest
+    :type Game: SemiNFG or iterSemiNFG
+    :arg dn: the name of the decision node where MCEUs are estimated
+    :type dn: str
+    :arg N: the max number of iterations for the estimation
+    :type N: int
+    :arg tol: the minimum number of samples per parent value
+    :type tol: int
+    :arg batch: the max number of worlds drawn at once. Memory use is
+       proportional to batch times the number of actions times the number of
+       nodes.
+    :type batch: int
+    :returns: the table of MCEUs with the shape of the CPT of dn
+
+    As in :py:func:`utilities.mceu`, the descendants of dn are redrawn for the
+    alternative actions in a SemiNFG, and the children of dn in an
+    iterSemiNFG. The utilities are computed row by row from the values of the
+    nodes that the utility or reward functions use. The values of the nodes of
+    Game are restored before returning.
+
+    """
+    state = Game.get_state()
+    try:
+        return _mceu_batch(Game, dn, N, tol, delta, verbose, batch)
+    finally:
+        Game.set_state(state)
+        state.release()
+
+def _mceu_batch(Game, dn, N, tol, delta, verbose, batch):
+    G = Game
+    plan = G.compile()
+    i = plan.ids[dn]
+    node = G.node_dict[dn]
+    player = node.player
+    CPT_shape = node.CPT.shape
+    nact = CPT_shape[-1]
+    if type(G) == pynfg.classes.seminfg.SemiNFG:
+        redraw = [plan.ids[n.name] for n in
+                  plan.resample_order([dn], exclude=[dn])]
+        unodes = [G.node_dict[nam] for nam in
+                  inspect.getargspec(G.u_functions[player])[0]]
+        ufoo = G.utility
+        uargs = [player]
+    else:
+        redraw = sorted(plan.ids[n.name] for n in G.children(dn))
+        unodes = [G.bn_part[bn][t-G.starttime] for bn in
+                  inspect.getargspec(G.r_functions[player])[0]
+                  for t in xrange(node.time, G.endtime+1)]
+        ufoo = G.npv_reward
+        uargs = [player, node.time, delta]
+    uids = [plan.ids[n.name] for n in unodes]
+    Utable = np.zeros(CPT_shape)
+    visits = np.zeros(CPT_shape)
+    Uflat = Utable.reshape(-1, nact)
+    vflat = visits.reshape(-1, nact)
+    actions = np.arange(nact)
+    n = 0
+    while np.min(visits)<tol or n<N:
+        k = min(batch, N-n) if n<N else batch
+        n += k
+        valueindex, contvalues = G.sample_batch(k)
+        messages = plan.rows(i, valueindex)
+        np.add.at(vflat, messages, 1)
+        # one row per world and action, the drawn action is kept as is
+        rep = np.repeat(valueindex, nact, axis=0)
+        repcont = dict((nam, np.repeat(contvalues[nam], nact)) for nam in
+                       contvalues)
+        rep[:, i] = np.tile(actions, k)
+        rows = np.flatnonzero(rep[:, i] != np.repeat(valueindex[:, i], nact))
+        for j in redraw:
+            plan._draw(j, rep, repcont, rows)
+        u = np.empty(k*nact)
+        for r in xrange(k*nact):
+            for nod, j in zip(unodes, uids):
+                if plan.card[j] < 0:
+                    nod.value = repcont[nod.name][r]
+                else:
+                    nod.set_valueindex(rep[r, j])
+            u[r] = ufoo(*uargs)
+        np.add.at(Uflat, (np.repeat(messages, nact), rep[:, i]), u)
+    if verbose:
+        print('number of unvisited messages:', \
+              (visits.size-np.count_nonzero(visits))/CPT_shape[-1])
+        print('least number of visits:', np.min(visits[np.nonzero(visits)]))
+    idx = (visits==0)
+    visits[idx] = 1
+    return Utable/visits
+
 def convert_2_pureCPT(anarray):
     """Convert an arbitrary matrix to a pure CPT w/ weight on maximum elements
 
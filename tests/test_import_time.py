@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Startup benchmark for the pynfg package
+
+Part of: PyNFG - a Python package for modeling and solving Network Form Games
+
+Copyright (C) 2013 James Bono
+
+GNU Affero General Public License
+
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# generous bound on the import time of pynfg in a fresh interpreter. Importing
+# pynfg loads numpy, and numpy alone takes most of this on slow machines.
+MAX_IMPORT_SECONDS = 0.5
+
+SCRIPT = """
+import sys, time
+t = time.time()
+import pynfg
+t = time.time()-t
+heavy = [m for m in ['scipy', 'matplotlib', 'networkx'] if m in sys.modules]
+print('%f %s' % (t, ','.join(heavy)))
+"""
+
+
+def import_pynfg():
+    out = subprocess.check_output([sys.executable, '-c', SCRIPT], cwd=ROOT)
+    t, heavy = out.decode().strip().partition(' ')[::2]
+    return float(t), [m for m in heavy.split(',') if m]
+
+
+def test_import_is_lazy():
+    t, heavy = import_pynfg()
+    assert heavy == []
+
+
+def test_import_time():
+    t = min(import_pynfg()[0] for i in range(3))
+    assert t < MAX_IMPORT_SECONDS
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for value lookups and draws of the node classes
+
+Part of: PyNFG - a Python package for modeling and solving Network Form Games
+
+Copyright (C) 2013 James Bono
+
+GNU Affero General Public License
+
+"""
+from __future__ import division
+import numpy as np
+import pytest
+import pynfg
+
+statespace = [np.array([[w, x], [y, z]]) for w in range(3) for x in range(3)
+              for y in range(3) for z in range(3)]
+
+
+def test_valueindex_array_space():
+    F = pynfg.DeterNode('F', lambda: statespace[5], {}, False,
+                        space=statespace)
+    for i in [0, 17, 80]:
+        assert F.get_valueindex(np.copy(statespace[i])) == i
+    # equal entries with a different dtype are the same value
+    assert F.get_valueindex(statespace[42].astype(float)) == 42
+    F.set_value(statespace[7])
+    assert F.valueindex == 7
+    with pytest.raises(ValueError):
+        F.get_valueindex(np.array([[5, 5], [5, 5]]))
+
+
+def test_valueindex_tuples_and_unhashables():
+    M = pynfg.ChanceNode('M', (np.ones(3)/3, [], [(20, 2), (10, 1), (5, .5)]))
+    assert M.get_valueindex((5, .5)) == 2
+    D = pynfg.DecisionNode('D', 'p', [{'a': 1}, {'b': 2}])
+    assert D.get_valueindex({'b': 2}) == 1
+    D.space.append('x')
+    assert D.get_valueindex('x') == 2
+    D.space = ['y', 'z']
+    assert D.get_valueindex('z') == 1
+
+
+def test_cumCPT_cache_invalidation():
+    P = pynfg.ChanceNode('P', (np.array([.5, .5]), [], ['h', 'l']))
+    D = pynfg.DecisionNode('D', 'p', [0, 1, 2], parents=[P])
+    P.draw_value()
+    D.CPT = np.array([[1., 0, 0], [1., 0, 0]])
+    assert D.draw_value() == 0
+    # reassignment of the CPT
+    D.CPT = np.array([[0., 0, 1], [0., 0, 1]])
+    assert D.draw_value() == 2
+    # in-place changes by the node methods
+    D.uniformCPT()
+    assert np.allclose(D._cumCPT()[0], [[1/3, 2/3, 1]]*2)
+    D.perturbCPT(0.5)
+    assert np.allclose(D._cumCPT()[0], np.cumsum(D.CPT, axis=-1))
+    # in-place changes elsewhere
+    D.CPT[:] = [0, 1, 0]
+    D.reset_CPTcache()
+    assert D.draw_value() == 1
+
+
+def test_pure_CPT_draws_without_random_numbers():
+    P = pynfg.ChanceNode('P', (np.array([.5, .5]), [], ['h', 'l']))
+    D = pynfg.DecisionNode('D', 'p', [0, 1, 2], parents=[P])
+    D.randomCPT(mixed=False)
+    assert D._cumCPT()[1] is not None
+    state = np.random.get_state()[1].copy()
+    for v in ['h', 'l']:
+        assert D.draw_value({'P': v}) == np.argmax(D.CPT[P.get_valueindex(v)])
+    assert np.all(np.random.get_state()[1] == state)
+    batch = D.draw_batch(np.array([[0], [1], [1]]))
+    assert np.all(batch == np.argmax(D.CPT, axis=-1)[[0, 1, 1]])
+    D.randomCPT(mixed=True)
+    assert D._cumCPT()[1] is None
+
+
+def test_tabulated_deternode():
+    A = pynfg.ChanceNode('A', (np.ones(3)/3, [], [0, 1, 2]))
+    B = pynfg.DecisionNode('B', 'p', [0, 1, 2, 3])
+    calls = []
+
+    def fun(a=0, b=0, c=1):
+        calls.append((a, b))
+        return c*(a+b)
+
+    F = pynfg.DeterNode('F', fun, {'a': A, 'b': B, 'c': 1}, False,
+                        space=range(5), tabulate=True)
+    assert F.table.shape == (3, 4)
+    assert F.table[1, 2] == 3
+    assert F.table[2, 3] == -1  # 5 is not in the space
+    ncalls = len(calls)
+    A.set_value(1)
+    B.set_value(3)
+    assert F.draw_value() == 4
+    assert F.prob() == 1
+    assert F.prob({'b': 0}, 4) == 0
+    assert F.prob({'b': 0}, 1) == 1
+    assert F.prob({'b': 0}, 99) == 0
+    batch = F.draw_batch(np.array([[0, 0], [2, 1], [1, 3]]), [None, None])
+    assert list(batch) == [0, 3, 4]
+    assert len(calls) == ncalls
+    # entries outside the space call the function
+    with pytest.raises(ValueError):
+        F.draw_value({'a': 2, 'b': 3})
+    assert len(calls) == ncalls+1
+
+
+def test_deternode_memo():
+    C = pynfg.ChanceNode('C', (np.ones(2)/2, [], [0.5, 1.5]))
+    calls = []
+
+    def fun(x=0, y=2.):
+        calls.append(x)
+        return x*y
+
+    F = pynfg.DeterNode('F', fun, {'x': C}, True, memo=2)
+    for v in [0.5, 1.5, 0.5, 0.5]:
+        assert F.draw_value({'x': v}) == 2*v
+    assert (F.memo_hits, F.memo_misses) == (2, 2)
+    assert F.prob({'x': 1.5}, 3.) == 1
+    assert F.memo_hits == 3
+    # least recently used entry is evicted
+    F.draw_value({'x': 7.})
+    F.draw_value({'x': 1.5})
+    F.draw_value({'x': 0.5})
+    assert calls == [0.5, 1.5, 7., 0.5]
+    F.set_memo(None)
+    F.draw_value({'x': 7.})
+    assert len(calls) == 5 and F.memo_hits == 0
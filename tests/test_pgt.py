@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the PGT intelligence solvers
+
+Part of: PyNFG - a Python package for modeling and solving Network Form Games
+
+Copyright (C) 2013 James Bono
+
+GNU Affero General Public License
+
+"""
+from __future__ import division
+import numpy as np
+import pynfg
+from pynfg.pgtsolutions.intelligence.coordinated import coordinated_MC, \
+    coordinated_MH
+from pynfg.pgtsolutions.intelligence.policy import policy_MC
+from pynfg.pgtsolutions.intelligence.iterated import iterated_MC
+from test_sampling import market_game
+
+
+def repeated_game(T=3):
+    """A small iterSemiNFG where a state and two players repeat T times"""
+    nodes = set()
+    prev = None
+    for t in range(T):
+        if prev is None:
+            state = pynfg.ChanceNode('S%s' % t, (np.array([.5, .5]), [],
+                                                 [0, 1]),
+                                     basename='S', time=t)
+        else:
+            state = pynfg.ChanceNode('S%s' % t, (np.array([[.9, .1], [.2, .8]]),
+                                                 [prev], [0, 1]),
+                                     basename='S', time=t)
+        a = pynfg.DecisionNode('A%s' % t, 'a', [0, 1], parents=[state],
+                               basename='A', time=t)
+        b = pynfg.DecisionNode('B%s' % t, 'b', [0, 1], parents=[state],
+                               basename='B', time=t)
+        nodes.update([state, a, b])
+        prev = a
+
+    def ra(S=0, A=0, B=0):
+        return 1.*(A == S) + .5*(B == A)
+
+    def rb(S=0, A=0, B=0):
+        return 1.*(B != S)
+
+    G = pynfg.iterSemiNFG(nodes, {'a': ra, 'b': rb})
+    for bn in ['A', 'B']:
+        G.bn_part[bn][0].randomCPT(mixed=True)
+        G.set_CPTs({bn: G.bn_part[bn][0].CPT})
+    return G
+
+
+def welfare(G):
+    G.sample()
+    return sum([G.npv_reward(p, G.starttime, 1.) for p in G.players])
+
+
+def snapshot(G):
+    cpts = G.get_decisionCPTs()
+    return dict((k, (id(v), v.copy())) for k, v in cpts.items())
+
+
+def assert_untouched(G, snap):
+    for k, v in G.get_decisionCPTs().items():
+        assert id(v) == snap[k][0]
+        assert np.all(v == snap[k][1])
+        assert v.flags.writeable
+
+
+def test_static_solvers_leave_game_untouched():
+    np.random.seed(3)
+    G = market_game()
+    snap = snapshot(G)
+
+    def static_welfare(G):
+        G.sample()
+        return G.utility('mike')+G.utility('trey')
+
+    intel, funcout, weight = coordinated_MC(G, 3, .2, 3, 4, innoise=.2,
+                                            integrand=static_welfare,
+                                            satisfice=G)
+    assert sorted(intel.keys()) == [1, 2, 3]
+    assert_untouched(G, snap)
+    density = lambda iq: np.prod(np.array(iq.values())+.1)
+    intel, funcout, dens = coordinated_MH(G, 3, density, .2, 3, 4,
+                                          innoise=.2, integrand=static_welfare,
+                                          satisfice=G)
+    assert len(dens) == 3
+    assert_untouched(G, snap)
+
+
+def test_iterated_solvers_leave_game_untouched():
+    np.random.seed(4)
+    G = repeated_game()
+    snap = snapshot(G)
+    intel, funcout, weight = policy_MC(G, 3, .2, 3, 4, innoise=.2,
+                                       integrand=welfare, satisfice=G)
+    assert sorted(intel[1].keys()) == ['a', 'b']
+    assert_untouched(G, snap)
+    intel, funcout, weight = iterated_MC(G, 2, .2, 2, 3, innoise=.2,
+                                         integrand=welfare)
+    assert len(intel[2]['A']) == 3
+    assert_untouched(G, snap)
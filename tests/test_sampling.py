@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for sampling, structure and state of SemiNFG and iterSemiNFG objects
+
+Part of: PyNFG - a Python package for modeling and solving Network Form Games
+
+Copyright (C) 2013 James Bono
+
+GNU Affero General Public License
+
+"""
+from __future__ import division
+import numpy as np
+import pytest
+import scipy.stats.distributions as randvars
+import pynfg
+
+
+def market_game():
+    """A small static game with CPT, deterministic and scipy nodes"""
+    market = pynfg.ChanceNode('market', (np.array([.5, .5]), [], ['h', 'l']))
+    trey = pynfg.DecisionNode('trey', 'trey', [10, 20, 30], parents=[market])
+    signal = pynfg.ChanceNode('signal', (np.array([[.8, .2], [.3, .7]]),
+                                         [market], ['hi', 'lo']))
+    mike = pynfg.DecisionNode('mike', 'mike', [10, 20, 30], parents=[signal])
+
+    def total(a=0, b=0):
+        return a+b
+
+    D = pynfg.DeterNode('D', total, {'a': trey, 'b': mike}, True)
+    C = pynfg.ChanceNode('C', distip=(randvars.norm, [D, 1]))
+
+    def umike(D, mike):
+        return mike*(100-D)
+
+    def utrey(D, trey):
+        return trey*(100-D)
+
+    G = pynfg.SemiNFG(set([market, trey, signal, mike, D, C]),
+                      {'mike': umike, 'trey': utrey})
+    trey.randomCPT(mixed=True)
+    mike.randomCPT(mixed=True)
+    return G
+
+
+def test_sample_batch_shapes():
+    G = market_game()
+    valueindex, contvalues = G.sample_batch(50)
+    assert valueindex.shape == (50, len(G.iterator))
+    assert sorted(contvalues.keys()) == ['C', 'D']
+    names = [n.name for n in G.iterator]
+    for nam in ['D', 'C']:
+        assert np.all(valueindex[:, names.index(nam)] == -1)
+        assert len(contvalues[nam]) == 50
+    for nam in ['market', 'trey', 'signal', 'mike']:
+        col = valueindex[:, names.index(nam)]
+        assert np.all(col >= 0)
+        assert np.all(col < len(G.node_dict[nam].space))
+
+
+def test_sample_batch_matches_CPTs():
+    np.random.seed(1)
+    G = market_game()
+    valueindex, contvalues = G.sample_batch(20000)
+    names = [n.name for n in G.iterator]
+    market = valueindex[:, names.index('market')]
+    for nam in ['trey', 'signal']:
+        col = valueindex[:, names.index(nam)]
+        for m in range(2):
+            freq = np.bincount(col[market == m],
+                               minlength=len(G.node_dict[nam].space))
+            freq = freq/np.sum(market == m)
+            assert np.allclose(freq, G.node_dict[nam].CPT[m], atol=0.03)
+    trey = np.array(G.node_dict['trey'].space)[valueindex[:, names.index('trey')]]
+    mike = np.array(G.node_dict['mike'].space)[valueindex[:, names.index('mike')]]
+    assert np.allclose(contvalues['D'], trey+mike)
+
+
+def test_plan_reused_until_structure_changes():
+    G = market_game()
+    plan = G.compile()
+    G.node_dict['trey'].randomCPT(mixed=True)
+    assert G.compile() is plan
+    G.node_dict['market'].space.append('m')
+    assert G.compile() is not plan
+
+
+def test_plan_loglike_matches_loglike():
+    G = market_game()
+    plan = G.compile()
+    valueindex, contvalues = G.sample_batch(10)
+    ll = plan.loglike(valueindex, contvalues)
+    for r in range(10):
+        for i in range(plan.size):
+            if plan.nodes[i].continuous:
+                plan.nodes[i].set_value(contvalues[plan.names[i]][r])
+            else:
+                plan.nodes[i].set_valueindex(valueindex[r, i])
+        assert np.allclose(ll[r], G.loglike())
+
+
+def test_state_restores_values_and_CPTs():
+    G = market_game()
+    G.sample()
+    trey = G.node_dict['trey']
+    CPT, value = trey.CPT, trey.value
+    state = G.get_state()
+    trey.perturbCPT(.5)
+    assert trey.CPT is not CPT  # copy on write
+    G.sample()
+    G.set_state(state)
+    assert trey.CPT is CPT and trey.value == value
+    with pytest.raises(ValueError):
+        trey.CPT[0, 0] = 1
+    trey.thaw_CPT()[0] = [1, 0, 0]
+    assert np.all(CPT == state.CPTs['trey'])
+    state.release()
+    assert CPT.flags.writeable
+
+
+def test_state_keeps_shared_CPTs_shared():
+    from test_pgt import repeated_game
+    G = repeated_game()
+    state = G.get_state()
+    G.set_state(state.clone())
+    G.bn_part['A'][0].perturbCPT(.5)
+    CPTs = [n.CPT for n in G.bn_part['A']]
+    assert CPTs[0] is not state.CPTs['A0']
+    assert all(CPT is CPTs[0] for CPT in CPTs)
+
+
+def test_resample_order():
+    G = market_game()
+    plan = G.compile()
+    names = lambda nodes: [n.name for n in nodes]
+    order = plan.resample_order(['trey'])
+    assert names(order) == [n for n in plan.names if n in ['trey', 'D', 'C']]
+    assert plan.resample_order(set(['trey'])) is order
+    assert names(plan.resample_order(['signal', 'trey'], exclude=['D'])) == \
+        [n for n in plan.names if n in ['signal', 'trey', 'mike', 'C']]
+    assert names(plan.resample_order(exclude=['market'])) == plan.names[1:]
+    G.sample()
+    values = G.get_values()
+    G.sample(start=['mike'], exclude=['C'])
+    for nam in ['market', 'trey', 'signal', 'C']:
+        assert G.node_dict[nam].get_value() == values[nam]
+    assert G.node_dict['D'].get_value() == G.node_dict['trey'].get_value() + \
+        G.node_dict['mike'].get_value()
+
+
+def test_reachability_index():
+    from test_pgt import repeated_game
+    G = repeated_game(5)
+    for n in G.nodes:
+        desc, stack = set(), list(G.edges[n.name])
+        while stack:
+            m = stack.pop()
+            if m not in desc:
+                desc.add(m)
+                stack.extend(G.edges[m.name])
+        assert G.descendants(n.name) == desc
+        assert G.ancestors(n.name) == \
+            set(m for m in G.nodes if n in G.descendants(m.name))
+    assert G.descendants('A0') is G.descendants('A0')
+    assert G.descendants('B4') == set()
+
+
+def test_levels():
+    G = market_game()
+    names = lambda nodes: [n.name for n in nodes]
+    assert [names(l) for l in G.levels] == \
+        [['market'], ['signal', 'trey'], ['mike'], ['D'], ['C']]
+    assert G.iterator == [n for l in G.levels for n in l]
+    plan = G.compile()
+    assert [list(l) for l in plan.levels] == [[0], [1, 2], [3], [4], [5]]
+    A = pynfg.ChanceNode('A', (np.array([.5, .5]), [], [0, 1]))
+    B = pynfg.DeterNode('B', lambda a=0: a, {'a': A}, False, space=[0, 1])
+    A.parents['B'] = B
+    with pytest.raises(ValueError):
+        pynfg.SemiNFG(set([A, B]))
+
+
+def test_long_chain():
+    T = 3000
+    chain = [pynfg.ChanceNode('X0', (np.array([.5, .5]), [], [0, 1]))]
+    for t in xrange(1, T):
+        chain.append(pynfg.ChanceNode('X%s' % t,
+                                      (np.array([[.9, .1], [.1, .9]]),
+                                       [chain[-1]], [0, 1])))
+    G = pynfg.SemiNFG(set(chain))
+    assert G.iterator == chain
+    assert len(G.levels) == T
+    assert len(G.descendants('X0')) == T-1
+    assert len(G.ancestors('X%s' % (T-1))) == T-1
+    G.sample()
+    G.sample(start=['X2000'])
+    assert G.sample_batch(3)[0].shape == (3, T)
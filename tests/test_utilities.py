@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the expected utility estimators in pynfg.utilities
+
+Part of: PyNFG - a Python package for modeling and solving Network Form Games
+
+Copyright (C) 2013 James Bono
+
+GNU Affero General Public License
+
+"""
+from __future__ import division
+import numpy as np
+from pynfg.utilities.utilities import mceu, mceu_batch
+from test_sampling import market_game
+from test_pgt import repeated_game, snapshot, assert_untouched
+
+
+def exact_trey_EU(G):
+    """The exact MCEU table of trey in the market game"""
+    signal = G.node_dict['signal'].CPT
+    mike = G.node_dict['mike']
+    pmike = np.dot(signal, mike.CPT)
+    trey = np.array(G.node_dict['trey'].space)
+    EU = np.zeros((2, 3))
+    for m in range(2):
+        for k in range(3):
+            EU[m] += pmike[m, k]*trey*(100-trey-mike.space[k])
+    return EU
+
+
+def test_mceu_batch_static():
+    np.random.seed(5)
+    G = market_game()
+    snap = snapshot(G)
+    G.sample()
+    values = G.get_values()
+    EU = mceu_batch(G, 'trey', 3000, tol=10, batch=700)
+    assert EU.shape == G.node_dict['trey'].CPT.shape
+    assert np.allclose(EU, exact_trey_EU(G), atol=15)
+    assert np.allclose(mceu(G, 'trey', 3000, tol=10), EU, atol=30)
+    assert G.get_values() == values
+    assert_untouched(G, snap)
+
+
+def test_mceu_batch_iterated():
+    np.random.seed(6)
+    G = repeated_game(3)
+    for dn in ['A1', 'B0']:
+        EU = mceu_batch(G, dn, 4000, tol=50)
+        assert np.allclose(mceu(G, dn, 10**6, tol=1500), EU, atol=0.15)